@@ -3,61 +3,1384 @@
 
 import sys
 import os
+import json
+import time
+import wave
+import bisect
+import struct
+import argparse
+import threading
 import numpy as np
+from collections import OrderedDict, deque, namedtuple
 from PyQt5.QtWidgets import (QApplication, QWidget, QVBoxLayout, QHBoxLayout, 
                              QLabel, QLineEdit, QPushButton, QFrame, QSlider, 
-                             QComboBox, QCheckBox, QSpacerItem, QSizePolicy, QMessageBox)
-from PyQt5.QtGui import QPainter, QColor, QPen, QFont, QPainterPath, QIcon, QPixmap
-from PyQt5.QtCore import Qt, QTimer, QIODevice, QRect
+                             QComboBox, QCheckBox, QSpacerItem, QSizePolicy, QMessageBox,
+                             QDialog, QTableWidget, QSpinBox, QDoubleSpinBox, QHeaderView,
+                             QFileDialog, QInputDialog, QAction, QActionGroup)
+from PyQt5.QtGui import QPainter, QColor, QPen, QFont, QIcon, QPixmap, QPolygonF, QImage
+from PyQt5.QtCore import Qt, QObject, QTimer, QIODevice, QRect, QPointF, QEvent, pyqtSignal
 
 # GNOME xcb/wayland compatibility fix
 os.environ["QT_QPA_PLATFORM"] = "xcb"
 
+# Değişmez parametre görüntüsü: her değişiklikte bir kez kurulur, ses tarafı tek referans okuyarak tutarlı bir set görür
+WaveParams = namedtuple("WaveParams", "freq w_type rect amp_p amp_n is_asym duty dual_trace timebase awg",
+                        defaults=(440.0, "Sine", "Full", 0.05, 0.05, False, 0.5, False, 50, None))
+
+class WavetableCache:
+    # Band-limited, mip-mapped tables: level k keeps harmonics up to TOPS[k]
+    SIZE = 4096
+    TOPS = (SIZE // 2 - 1) >> np.arange(11)
+
+    def __init__(self, max_entries=24):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.pulse_gain = None
+
+    def harmonics(self, wave_type, duty):
+        n = np.arange(self.SIZE // 2 + 1)
+        c = np.zeros(n.size, dtype=np.complex128)
+        if wave_type == "Sine":
+            c[1] = -0.5j
+        elif wave_type == "Square":
+            c[0] = 2 * duty - 1
+            c[1:] = (1 - np.exp(-2j * np.pi * n[1:] * duty)) / (1j * np.pi * n[1:])
+        elif wave_type == "Triangle":
+            c[1::2] = -4 / (np.pi * n[1::2]) ** 2
+        elif wave_type == "Saw":
+            # Yükselen testere 2p-1; PWM iki testerenin farkından darbe üretir
+            c[1:] = 1j / (np.pi * n[1:])
+        return c
+
+    def build(self, wave_type, duty):
+        c = self.harmonics(wave_type, duty) * self.SIZE
+        tables = np.empty((len(self.TOPS), self.SIZE + 1), dtype=np.float32)
+        for level, top in enumerate(self.TOPS):
+            spec = c.copy(); spec[top + 1:] = 0
+            tables[level, :-1] = np.fft.irfft(spec, self.SIZE)
+        tables[:, -1] = tables[:, 0]
+        if wave_type != "Saw":
+            # Gibbs aşımı (üst seviyede yalnızca temel: 4/pi) kırpılırsa aliasing geri gelir; her seviye tepe 1'e indirilir
+            tables /= np.maximum(np.abs(tables).max(axis=1, keepdims=True), 1)
+        return tables, np.diff(tables, axis=1, append=tables[:, 1:2])
+
+    def get(self, wave_type, duty=0.5):
+        # Kare dalga için görev döngüsü %1'lik kovalara yuvarlanır
+        bucket = min(99, max(1, int(round(duty * 100)))) if wave_type == "Square" else 0
+        key = (wave_type, bucket)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                entry = self.entries[key] = self.build(wave_type, bucket / 100.0)
+                if len(self.entries) > self.max_entries: self.entries.popitem(last=False)
+            else:
+                self.entries.move_to_end(key)
+        return entry
+
+    def pulse_gains(self):
+        # PWM darbesi 2d-1-(s(p)-s(p-d)) ham testerelerden kurulur; her seviyede tüm görev döngülerindeki en büyük tepe 1'e indirilir
+        if self.pulse_gain is None:
+            tables, _ = self.get("Saw")
+            shifts = np.arange(1, 100) * self.SIZE // 100
+            peaks = [max(float(np.abs(2 * k / self.SIZE - 1 - (t[:-1] - np.roll(t[:-1], k))).max()) for k in shifts) for t in tables]
+            self.pulse_gain = (1 / np.maximum(peaks, 1)).astype(np.float32)
+        return self.pulse_gain
+
+    def level(self, frequency, sample_rate):
+        hmax = (sample_rate / 2) / max(abs(frequency), 1e-9)
+        return min(int(np.count_nonzero(self.TOPS > hmax)), len(self.TOPS) - 1)
+
+    def read(self, table, diff, ph, out, frac, idx, offsets=None):
+        # Doğrusal ara değerleme, tüm ara sonuçlar verilen tamponlara yazılır
+        # offsets: art arda eklenmiş tablolarda her satırın başlangıcı (2-B okuma)
+        np.multiply(ph, np.float32(self.SIZE), out=frac)
+        np.floor(frac, out=out)
+        np.copyto(idx, out, casting="unsafe")
+        if offsets is not None: np.add(idx, offsets, out=idx)
+        np.subtract(frac, out, out=frac)
+        np.take(diff, idx, out=out, mode="wrap"); np.multiply(out, frac, out=frac)
+        np.take(table, idx, out=out, mode="wrap"); np.add(out, frac, out=out)
+        return out
+
+WAVETABLES = WavetableCache()
+
+class OscillatorBank:
+    # Her satır bir osilatör; blok (osilatör x örnek) tek bir 2-B hesapla üretilir.
+    # Ayarlar değişmez; yeni ayar için yeni bank kurulup tek atamayla değiştirilir.
+    # quadrature: satırlar +0.25 döngü kaydırılmış fazla ikinci kez eklenir, I ve Q aynı hesaptan çıkar.
+    def __init__(self, oscillators, sample_rate, headroom_db=6.0, clip="Hard", previous=None, quadrature=False):
+        self.oscillators = list(oscillators)
+        self.sample_rate = sample_rate
+        self.gain = np.float32(10 ** (-headroom_db / 20))
+        self.clip = clip
+        n = len(self.oscillators)
+        self.phases = np.zeros(n)
+        if previous is not None:
+            k = min(n, previous.phases.size); self.phases[:k] = previous.phases[:k]
+        self.step = np.empty(n)
+
+        def column(key, dtype=np.float64):
+            return np.array([getattr(o, key) for o in self.oscillators], dtype=dtype).reshape(n, 1)
+        self.inc = column('freq') / sample_rate
+        self.amp_p = column('amp_p', np.float32)
+        self.amp_n = np.where(column('is_asym', bool), column('amp_n', np.float32), self.amp_p)
+        self.half = np.array([o.rect == "Half" for o in self.oscillators]).reshape(n, 1)
+
+        rows, drows = [np.zeros(0, dtype=np.float32)], [np.zeros(0, dtype=np.float32)]
+        for o in self.oscillators:
+            tables, diffs = WAVETABLES.get(o.w_type, o.duty)
+            level = WAVETABLES.level(o.freq, sample_rate)
+            rows.append(tables[level]); drows.append(diffs[level])
+        self.tables, self.diffs = np.concatenate(rows), np.concatenate(drows)
+        self.offsets = (np.arange(n, dtype=np.int32) * (WavetableCache.SIZE + 1)).reshape(n, 1)
+        self.rows = 2 if quadrature else 1
+        if quadrature:
+            self.amp_p, self.amp_n, self.half, self.offsets = (np.tile(a, (2, 1)) for a in (self.amp_p, self.amp_n, self.half, self.offsets))
+        self.capacity = 0
+
+    def reserve(self, samples):
+        n = len(self.oscillators) * self.rows
+        self.capacity = samples
+        self.ramp = np.arange(samples, dtype=np.float64)
+        self.ph64 = np.empty((n, samples), dtype=np.float64)
+        self.floor64 = np.empty((n, samples), dtype=np.float64)
+        self.ph = np.empty((n, samples), dtype=np.float32)
+        self.y = np.empty((n, samples), dtype=np.float32)
+        self.work = np.empty((n, samples), dtype=np.float32)
+        self.idx = np.empty((n, samples), dtype=np.int32)
+
+    def render(self, samples, out):
+        # out: (rows, samples); mono için tek satır, I/Q için iki satır
+        if samples > self.capacity: self.reserve(samples)
+        n = len(self.oscillators)
+        ph64 = self.ph64[:, :samples]
+        np.multiply(self.ramp[:samples], self.inc, out=ph64[:n])
+        np.add(ph64[:n], self.phases.reshape(-1, 1), out=ph64[:n])
+        if self.rows == 2: np.add(ph64[:n], 0.25, out=ph64[n:])
+        np.subtract(ph64, np.floor(ph64, out=self.floor64[:, :samples]), out=ph64)
+        np.multiply(self.inc[:, 0], samples, out=self.step)
+        np.add(self.phases, self.step, out=self.phases); np.remainder(self.phases, 1.0, out=self.phases)
+        ph = self.ph[:, :samples]
+        np.copyto(ph, ph64, casting="same_kind")
+
+        y, work = self.y[:, :samples], self.work[:, :samples]
+        WAVETABLES.read(self.tables, self.diffs, ph, y, work, self.idx[:, :samples], self.offsets)
+        np.maximum(y, 0, out=y, where=self.half)
+        # Satır başına kazanç = amp_n + (amp_p - amp_n) * (y >= 0)
+        np.greater_equal(y, 0, out=work)
+        np.multiply(work, self.amp_p - self.amp_n, out=work)
+        np.add(work, self.amp_n, out=work)
+        np.multiply(y, work, out=y)
+
+        np.sum(y.reshape(self.rows, n, samples), axis=1, out=out)
+        np.multiply(out, self.gain, out=out)
+        if self.clip == "Soft": np.tanh(out, out=out)
+        return out
+
+class Modulation:
+    # Modülatör fazı bloklar arasında taşınır; değerler m ∈ [-1, 1] tek dizi işlemleriyle hesaplanır.
+    # depth: AM'de modülasyon indeksi (0-1), FM'de sapma (Hz), PWM'de görev döngüsü sapması (0-0.49)
+    KINDS = ("AM", "FM", "PWM")
+    SHAPES = ("Sine", "Square", "Triangle")
+
+    def __init__(self, kind="AM", shape="Sine", rate=1.0, depth=0.5, sample_rate=44100, previous=None):
+        self.kind, self.shape = kind, shape
+        self.rate, self.depth = float(rate), float(depth)
+        self.inc = self.rate / sample_rate
+        self.phase = previous.phase if previous is not None else 0.0
+        self.capacity = 0
+
+    def reserve(self, samples):
+        self.capacity = samples
+        self.ramp = np.arange(samples, dtype=np.float64)
+        self.ph = np.empty(samples, dtype=np.float64)
+        self.m = np.empty(samples, dtype=np.float64)
+
+    def advance(self, samples):
+        if samples > self.capacity: self.reserve(samples)
+        ph, m = self.ph[:samples], self.m[:samples]
+        np.multiply(self.ramp[:samples], self.inc, out=ph)
+        np.add(ph, self.phase, out=ph)
+        np.subtract(ph, np.floor(ph, out=m), out=ph)
+        self.phase = (self.phase + self.inc * samples) % 1.0
+        if self.shape == "Sine":
+            np.multiply(ph, 2 * np.pi, out=m); np.sin(m, out=m)
+        elif self.shape == "Square":
+            np.less(ph, 0.5, out=m); np.multiply(m, 2, out=m); np.subtract(m, 1, out=m)
+        else:
+            np.subtract(ph, 0.5, out=m); np.abs(m, out=m); np.multiply(m, -4, out=m); np.add(m, 1, out=m)
+        return m
+
+class FrequencySweep:
+    # Anlık faz kapalı formda hesaplanır, blok boyutu ne olursa olsun örnek-doğrudur.
+    # Lineer: f0*t + (f1-f0)*t^2/(2T)    Logaritmik: f0*T/ln(r) * (r^(t/T) - 1), r = f1/f0
+    def __init__(self, start, stop, duration, mode="Linear", repeat=False, sample_rate=44100):
+        self.start, self.stop = float(start), float(stop)
+        self.sample_rate = sample_rate
+        self.total = max(1, int(round(duration * sample_rate)))
+        self.duration = self.total / sample_rate
+        self.log = mode == "Log" and start > 0 and stop > 0 and start != stop
+        self.rate = np.log(self.stop / self.start) / self.duration if self.log else 0.0
+        self.repeat = repeat
+        self.position = 0
+        self.base = 0.0
+        self.done = False
+        self.end_phase = self.cycles(self.total) % 1.0
+        self.capacity = 0
+
+    def reserve(self, samples):
+        self.capacity = samples
+        self.m = np.empty(samples, dtype=np.float64)
+        self.tmp = np.empty(samples, dtype=np.float64)
+
+    def cycles(self, k):
+        t = k / self.sample_rate
+        if self.log: return self.start / self.rate * (np.exp(t * self.rate) - 1)
+        return t * (self.start + (self.stop - self.start) / (2 * self.duration) * t)
+
+    def cycles_into(self, k, tmp):
+        np.multiply(k, 1.0 / self.sample_rate, out=k)
+        if self.log:
+            np.multiply(k, self.rate, out=tmp); np.exp(tmp, out=tmp); np.subtract(tmp, 1, out=tmp)
+            np.multiply(tmp, self.start / self.rate, out=k)
+        else:
+            np.multiply(k, (self.stop - self.start) / (2 * self.duration), out=tmp)
+            np.add(tmp, self.start, out=tmp); np.multiply(k, tmp, out=k)
+
+    def frequency_at(self, k):
+        if self.done: return self.stop
+        t = min(k, self.total) / self.sample_rate
+        if self.log: return self.start * np.exp(t * self.rate)
+        return self.start + (self.stop - self.start) * t / self.duration
+
+    def current_phase(self):
+        return self.base if self.done else (self.base + self.cycles(self.position)) % 1.0
+
+    def advance(self, samples, ramp, out):
+        # out'a sarılmış faz bloğunu yazar, mip seviyesi için bloktaki en yüksek frekansı döndürür
+        if samples > self.capacity: self.reserve(samples)
+        m, tmp = self.m[:samples], self.tmp[:samples]
+        first, last = self.position, self.position + samples
+        peak = max(abs(self.frequency_at(first)), abs(self.frequency_at(last)))
+        if self.done:
+            np.multiply(ramp[:samples], self.stop / self.sample_rate, out=out)
+            np.add(out, self.base, out=out)
+            self.base = (self.base + self.stop / self.sample_rate * samples) % 1.0
+        elif self.repeat:
+            if last > self.total: peak = max(peak, abs(self.start), abs(self.stop))
+            # k = j*total + yerel; faz = base + j*end_phase + cycles(yerel)
+            np.add(ramp[:samples], first, out=out)
+            np.multiply(out, 1.0 / self.total, out=m); np.floor(m, out=m)
+            np.multiply(m, self.total, out=m); np.subtract(out, m, out=out)
+            np.multiply(m, self.end_phase / self.total, out=m)
+            self.cycles_into(out, tmp)
+            np.add(out, m, out=out); np.add(out, self.base, out=out)
+            j = last // self.total
+            self.base = (self.base + j * self.end_phase) % 1.0
+            self.position = last - j * self.total
+        else:
+            # Tek seferlik: bitişten sonra durma frekansında devam eder
+            np.add(ramp[:samples], first, out=out)
+            np.subtract(out, self.total, out=m); np.maximum(m, 0, out=m)
+            np.minimum(out, self.total, out=out)
+            self.cycles_into(out, tmp)
+            np.multiply(m, self.stop / self.sample_rate, out=m)
+            np.add(out, m, out=out); np.add(out, self.base, out=out)
+            self.position = last
+            if last >= self.total:
+                self.done = True
+                self.base = (self.base + self.end_phase + self.stop / self.sample_rate * (last - self.total)) % 1.0
+        np.subtract(out, np.floor(out, out=tmp), out=out)
+        return peak
+
+def read_wav_layout(path):
+    # wave modülü float WAV okuyamadığı için RIFF parçaları elle taranır
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        head = f.read(12)
+        if head[:4] != b"RIFF" or head[8:12] != b"WAVE": raise ValueError("not a RIFF/WAVE file")
+        fmt = None
+        while True:
+            chunk = f.read(8)
+            if len(chunk) < 8: break
+            cid, length = chunk[:4], struct.unpack("<I", chunk[4:])[0]
+            if cid == b"fmt ":
+                fmt = f.read(length); f.seek(length & 1, 1)
+            elif cid == b"data":
+                if fmt is None: raise ValueError("WAV data chunk before fmt chunk")
+                tag, channels, rate = struct.unpack("<HHI", fmt[:8])
+                bits = struct.unpack("<H", fmt[14:16])[0]
+                if tag == 0xFFFE: tag = struct.unpack("<H", fmt[24:26])[0]
+                dtype = {(1, 16): np.int16, (3, 32): np.float32}.get((tag, bits))
+                if dtype is None: raise ValueError(f"unsupported WAV encoding (format {tag}, {bits} bit)")
+                offset = f.tell()
+                frames = min(length, size - offset) // (channels * bits // 8)
+                return dtype, channels, rate, offset, frames
+            else:
+                f.seek(length + (length & 1), 1)
+    raise ValueError("WAV file has no data chunk")
+
+class ArbitraryWave:
+    # Tek periyotluk tablo ya da uzun kayıt; büyük dosyalar np.memmap ile eşlenir, RAM'e yüklenmez
+    RAW_TYPES = {".f32": np.float32, ".s16": np.int16}
+
+    def __init__(self, samples, name, native_rate=None, native=False):
+        self.samples = samples
+        self.length = len(samples)
+        self.scale = 1 / 32768 if samples.dtype == np.int16 else 1.0
+        self.name = name
+        self.native_rate = native_rate
+        self.native = native
+        self.capacity = 0
+
+    @staticmethod
+    def load(path, raw_dtype=None, native=None):
+        name = os.path.basename(path)
+        ext = os.path.splitext(path)[1].lower()
+        if ext == ".wav":
+            dtype, channels, rate, offset, frames = read_wav_layout(path)
+            if frames == 0: raise ValueError("WAV file has no samples")
+            data = np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=(frames, channels))[:, 0]
+            return ArbitraryWave(data, name, rate, True if native is None else native)
+        if ext in (".csv", ".txt"):
+            data = np.loadtxt(path, delimiter=",", ndmin=2, dtype=np.float64)[:, 0]
+            peak = np.abs(data).max() if data.size else 0
+            if peak > 1: data = data / peak
+            if data.size < 2: raise ValueError("CSV table needs at least two samples")
+            return ArbitraryWave(data.astype(np.float32), name, None, bool(native))
+        dtype = np.dtype(raw_dtype or ArbitraryWave.RAW_TYPES.get(ext, np.int16))
+        if os.path.getsize(path) < 2 * dtype.itemsize: raise ValueError("raw file is too short")
+        data = np.memmap(path, dtype=dtype, mode="r")
+        return ArbitraryWave(data, name, None, data.size > 65536 if native is None else native)
+
+    def with_native(self, native):
+        # Çalan anlık görüntüdeki nesne değiştirilmez; aynı örnekleri paylaşan yeni görünüm döner
+        return ArbitraryWave(self.samples, self.name, self.native_rate, native)
+
+    def frequency(self, sample_rate, frequency):
+        # Doğal hızda: tüm dosya bir "periyot", kendi örnekleme hızında çalınır
+        return (self.native_rate or sample_rate) / self.length if self.native else frequency
+
+    def reserve(self, samples):
+        self.capacity = samples
+        self.pos = np.empty(samples, dtype=np.float64)
+        self.idx = np.empty(samples, dtype=np.int64)
+        self.nxt = np.empty(samples, dtype=np.int64)
+        self.gather = np.empty(samples, dtype=self.samples.dtype)
+
+    def read(self, ph64, out, work):
+        # Uzun dosyalarda dizin hassasiyeti için float64 faz kullanılır
+        n = ph64.size
+        if n > self.capacity: self.reserve(n)
+        pos, idx, nxt, gather = self.pos[:n], self.idx[:n], self.nxt[:n], self.gather[:n]
+        np.multiply(ph64, self.length, out=pos)
+        np.copyto(idx, pos, casting="unsafe")
+        np.subtract(pos, idx, out=pos)
+        np.remainder(idx, self.length, out=idx)
+        np.add(idx, 1, out=nxt); np.remainder(nxt, self.length, out=nxt)
+        np.take(self.samples, idx, out=gather); np.copyto(out, gather, casting="unsafe")
+        np.take(self.samples, nxt, out=gather); np.copyto(work, gather, casting="unsafe")
+        np.subtract(work, out, out=work)
+        np.multiply(work, pos, out=work, casting="same_kind")
+        np.add(out, work, out=out)
+        if self.scale != 1.0: np.multiply(out, self.scale, out=out)
+        return out
+
+    def values(self, phase):
+        # Önizleme için (tahsisli, GUI tarafı)
+        pos = np.mod(phase, 1.0) * self.length
+        idx = pos.astype(np.int64) % self.length
+        a = self.samples[idx].astype(np.float64); b = self.samples[(idx + 1) % self.length].astype(np.float64)
+        return (a + (b - a) * (pos - np.floor(pos))) * self.scale
+
+class NoiseSource:
+    # Blok halinde gürültü: beyaz doğrudan üretilir, pembe (Voss-McCartney) ve kahverengi (sızdıran integratör)
+    # filtre durumunu bloklar arasında taşır; örnek başına Python döngüsü yoktur
+    TYPES = ("White Noise", "Pink Noise", "Brown Noise")
+    PINK_ROWS = 16
+    BROWN_CUTOFF = 5.0
+    BROWN_CHUNK = 1024
+
+    def __init__(self, seed=None):
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+        self.rows = np.zeros(self.PINK_ROWS); self.total = 0.0; self.count = 0
+        self.level = 0.0; self.brown_rate = None
+        self.capacity = 0
+
+    def reserve(self, samples):
+        self.capacity = samples
+        self.draw = np.empty(2 * samples, dtype=np.float32)
+        self.acc = np.empty(samples, dtype=np.float64)
+
+    def white(self, out):
+        self.rng.standard_normal(dtype=np.float32, out=out)
+        np.multiply(out, 1 / 3, out=out)
+
+    def pink(self, out):
+        # Her örnekte tam bir satır yenilenir (örnek sırasının sondaki sıfır sayısı); satır k'nin
+        # güncellemeleri 2^(k+1) adımlı bir dilimdir, toplamdaki değişim kümülatif toplamla bulunur
+        n, rows = out.size, self.PINK_ROWS
+        r, w = self.draw[:n], self.draw[n:2 * n]
+        self.rng.standard_normal(dtype=np.float32, out=self.draw[:2 * n])
+        delta = self.acc[:n]
+        for k in range(rows):
+            step, first = (1 << (k + 1), 1 << k) if k < rows - 1 else (1 << k, 0)
+            start = (first - self.count) % step
+            if start >= n: continue
+            sel, d = r[start::step], delta[start::step]
+            d[0] = sel[0] - self.rows[k]
+            np.subtract(sel[1:], sel[:-1], out=d[1:])
+            self.rows[k] = sel[-1]
+        np.cumsum(delta, out=delta)
+        np.add(delta, self.total, out=delta)
+        np.add(delta, w, out=delta)
+        np.multiply(delta, 1 / (3 * np.sqrt(rows + 1)), out=out)
+        self.total = self.rows.sum(); self.count += n
+
+    def brown(self, out, sample_rate):
+        # y[i] = a^i * (a*y0 + cumsum(x[k] * a^-k)); parça boyu a^-k büyümesini float64 sınırında tutar
+        if self.brown_rate != sample_rate:
+            self.brown_rate = sample_rate
+            a = self.leak = np.exp(-2 * np.pi * self.BROWN_CUTOFF / sample_rate)
+            k = np.arange(self.BROWN_CHUNK)
+            self.up, self.down = a ** k, a ** -k
+            self.brown_scale = np.sqrt(1 - a * a) / 3
+        n, a = out.size, self.leak
+        x = self.acc[:n]
+        self.rng.standard_normal(out=x)
+        for start in range(0, n, self.BROWN_CHUNK):
+            t = x[start:start + self.BROWN_CHUNK]; m = t.size
+            np.multiply(t, self.down[:m], out=t)
+            np.cumsum(t, out=t)
+            np.add(t, a * self.level, out=t)
+            np.multiply(t, self.up[:m], out=t)
+            self.level = t[-1]
+        np.multiply(x, self.brown_scale, out=out)
+
+    def render(self, kind, out, sample_rate):
+        if out.size > self.capacity: self.reserve(out.size)
+        if kind == "White Noise": self.white(out)
+        elif kind == "Pink Noise": self.pink(out)
+        else: self.brown(out, sample_rate)
+        return out
+
+class SampleRing:
+    # Tek üretici / tek tüketici: head'i yalnızca üretici, tail'i yalnızca tüketici yazar
+    def __init__(self, capacity, dtype=np.int16):
+        self.capacity = capacity
+        self.data = np.zeros(capacity, dtype=dtype)
+        self.head = 0
+        self.tail = 0
+
+    def fill(self):
+        return self.head - self.tail
+
+    def space(self):
+        return self.capacity - (self.head - self.tail)
+
+    def write(self, src):
+        n = min(len(src), self.space())
+        start = self.head % self.capacity
+        first = min(n, self.capacity - start)
+        self.data[start:start + first] = src[:first]
+        self.data[:n - first] = src[first:n]
+        self.head += n
+        return n
+
+    def read(self, dst):
+        n = min(len(dst), self.fill())
+        start = self.tail % self.capacity
+        first = min(n, self.capacity - start)
+        dst[:first] = self.data[start:start + first]
+        dst[first:n] = self.data[:n - first]
+        self.tail += n
+        return n
+
+class ScopeTap:
+    # Çıkışın son örneklerinin kopyası (ilk kanal, [-1, 1]); okuyucu tüketmez, yalnızca son N örneği alır
+    def __init__(self, capacity=1 << 18):
+        self.capacity = capacity
+        self.data = np.zeros(capacity, dtype=np.float32)
+        self.head = 0
+
+    def write(self, src):
+        n = len(src)
+        if n > self.capacity: src = src[n - self.capacity:]
+        start = self.head % self.capacity
+        first = min(len(src), self.capacity - start)
+        self.data[start:start + first] = src[:first]
+        self.data[:len(src) - first] = src[first:]
+        self.head += n
+
+    def read(self, stop, out):
+        # Mutlak örnek sırası `stop`ta biten len(out) örnek; halkadan taşmış kısım artık yazılmış veridir
+        n = min(len(out), self.capacity)
+        end = stop % self.capacity
+        if n <= end: out[:n] = self.data[end - n:end]
+        else:
+            out[:n - end] = self.data[self.capacity - (n - end):]
+            out[n - end:n] = self.data[:end]
+        return min(n, stop)
+
+    def latest(self, out):
+        return self.read(self.head, out)
+
+class ScopeTrigger:
+    # Kenar tetikleme: tap akışındaki yeni örneklerde tek dizi karşılaştırmasıyla seviye geçişi aranır.
+    # Free eski serbest akışı korur; Auto zaman aşımında serbest akışa düşer, Normal ve Single son tetiği tutar.
+    MODES = ("Free", "Auto", "Normal", "Single")
+    SLOPES = ("Rising", "Falling")
+    AUTO_TIMEOUT = 0.1
+
+    def __init__(self, mode="Free", slope="Rising", level=0.0, holdoff=0.0):
+        self.mode, self.slope = mode, slope
+        self.level, self.holdoff = float(level), float(holdoff)
+        self.armed = True
+        self.last = None
+        self.searched = 0
+        self.scratch = np.empty(0, dtype=np.float32)
+
+    @staticmethod
+    def crossings(x, level, rising=True):
+        # i: x[i] ile x[i+1] arasında seviye geçişi olan indeksler
+        if rising: return np.flatnonzero((x[:-1] < level) & (x[1:] >= level))
+        return np.flatnonzero((x[:-1] > level) & (x[1:] <= level))
+
+    def arm(self):
+        self.armed = True
+
+    def timed_out(self, head, sample_rate):
+        return self.last is None or head - self.last > self.AUTO_TIMEOUT * sample_rate
+
+    def find(self, tap, pre, post, sample_rate, level):
+        # Ekran penceresi [t - pre, t + post) tamamen tap içinde kalacak en son tetik noktası t; (t, kesir) ya da None
+        if self.mode == "Single" and not self.armed: return None
+        head = tap.head
+        stop = head - post
+        start = max(self.searched, head - tap.capacity + pre, 0)
+        holdoff = int(self.holdoff * sample_rate)
+        if self.last is not None: start = max(start, self.last + holdoff)
+        if stop - start < 1: return None
+        n = stop + 1 - start
+        if self.scratch.size < n: self.scratch = np.empty(n, dtype=np.float32)
+        x = self.scratch[:n]
+        tap.read(stop + 1, x)
+        self.searched = stop
+        idx = self.crossings(x, level, self.slope == "Rising")
+        if idx.size == 0: return None
+        i = idx[-1]
+        if holdoff > 0:
+            # Tetik zinciri ilk geçişten başlar, her tetikten sonra holdoff boyunca yeni geçiş kabul edilmez
+            i = idx[0]
+            while True:
+                k = np.searchsorted(idx, i + holdoff)
+                if k >= idx.size: break
+                i = idx[k]
+        a, b = float(x[i]), float(x[i + 1])
+        frac = (level - a) / (b - a) if b != a else 0.0
+        self.last = start + int(i)
+        if self.mode == "Single": self.armed = False
+        return self.last, frac
+
+Measurement = namedtuple("Measurement", "vpp vmin vmax rms mean freq duty")
+
+class StreamMeasurements:
+    # Üretilen akışın ölçümleri; blok başına sabit maliyetli biriktiriciler, pencere dolunca anlık görüntü yayımlanır.
+    # Frekans ve görev döngüsü eşiği önceki pencerenin orta seviyesidir (yarım doğrultmada da doğru kalır).
+    # Pencere en az iki periyot içerene kadar (en çok limit saniye) uzar; ortalama, RMS ve görev döngüsü
+    # ilk ve son yükselen geçiş arasındaki tam periyotlardan hesaplanır.
+    def __init__(self, sample_rate, window=0.25, limit=4.0):
+        self.sample_rate = sample_rate
+        self.window = max(1, int(window * sample_rate))
+        self.limit = max(self.window, int(limit * sample_rate))
+        self.result = None
+        self.mid = 0.0
+        self.prev = None
+        self.squares = np.empty(0, dtype=np.float32)
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.total = 0.0
+        self.energy = 0.0
+        self.high = 0
+        self.vmin, self.vmax = np.inf, -np.inf
+        self.crossings = 0
+        self.first = self.last = None
+        self.start = self.end = None
+
+    def mark(self, x, sq, k):
+        # Geçişten sonraki ilk örnekte (blok içi k) biriktiricilerin değeri: (örnek, toplam, enerji, yüksek)
+        return (self.count + k, self.total + float(np.add.reduce(x[:k], dtype=np.float64)),
+                self.energy + float(np.add.reduce(sq[:k], dtype=np.float64)), self.high + int(np.count_nonzero(x[:k] > self.mid)))
+
+    def update(self, x):
+        n = x.size
+        if n == 0: return
+        if self.squares.size < n: self.squares = np.empty(n, dtype=np.float32)
+        sq = np.square(x, out=self.squares[:n])
+        mid = self.mid
+        # Blok sınırındaki geçiş önceki bloğun son örneğiyle yakalanır; konumlar doğrusal ara değerlemeyle kesirli
+        idx = ScopeTrigger.crossings(x, mid)
+        a, b = x[idx], x[idx + 1]
+        pos = self.count + idx + (mid - a) / np.where(b != a, b - a, 1)
+        head = self.prev is not None and self.prev < mid <= x[0]
+        if head: pos = np.r_[self.count - 1 + (mid - self.prev) / (x[0] - self.prev), pos]
+        if pos.size:
+            if self.first is None:
+                self.first = float(pos[0]); self.start = self.mark(x, sq, 0 if head else idx[0] + 1)
+            self.last = float(pos[-1]); self.end = self.mark(x, sq, idx[-1] + 1 if idx.size else 0)
+            self.crossings += pos.size
+        self.total += float(np.add.reduce(x, dtype=np.float64))
+        self.energy += float(np.add.reduce(sq, dtype=np.float64))
+        self.vmin = min(self.vmin, float(x.min())); self.vmax = max(self.vmax, float(x.max()))
+        self.high += int(np.count_nonzero(x > mid))
+        self.prev = float(x[-1])
+        self.count += n
+        if self.count >= self.limit or (self.count >= self.window and self.crossings >= 3): self.publish()
+
+    def publish(self):
+        freq = (self.crossings - 1) * self.sample_rate / (self.last - self.first) if self.crossings >= 2 and self.last > self.first else 0.0
+        if freq > 0 and self.end[0] > self.start[0]:
+            # Tam periyotlar: kısmi periyot ortalamayı ve RMS'i kaydırmaz
+            n, total, energy, high = (e - s for e, s in zip(self.end, self.start))
+        else:
+            n, total, energy, high = self.count, self.total, self.energy, self.high
+        self.result = Measurement(self.vmax - self.vmin, self.vmin, self.vmax, np.sqrt(energy / n), total / n, freq, high / n)
+        self.mid = (self.vmax + self.vmin) / 2
+        # Pencere sınırı yeni pencerenin başlangıcıdır; önceki bloğun son örneği konum -1'dedir
+        self.reset()
+
+class SpectrumAnalyzer:
+    # Örtüşen çerçevelerde rfft; Hann penceresi boyut başına bir kez hesaplanır, ortalama artımlıdır
+    SIZES = (1024, 2048, 4096, 8192, 16384)
+    MAX_FRAMES = 4
+
+    def __init__(self, size=4096, overlap=0.5, averages=8):
+        self.windows = {}
+        self.overlap = overlap
+        self.averages = averages
+        self.set_size(size)
+
+    def window(self, size):
+        if size not in self.windows:
+            w = np.hanning(size)
+            self.windows[size] = (w, 2.0 / w.sum())
+        return self.windows[size]
+
+    def set_size(self, size):
+        self.size = 1 << max(1, int(size) - 1).bit_length()
+        self.hop = max(1, int(self.size * (1 - self.overlap)))
+        self.win, self.norm = self.window(self.size)
+        self.frame = np.empty(self.size)
+        self.power = np.zeros(self.size // 2 + 1)
+        self.scratch = np.empty(self.size // 2 + 1)
+        self.frames = 0; self.pos = None; self.frame_time = 0.0
+
+    def reset(self):
+        self.set_size(self.size)
+
+    def feed(self, tap):
+        # Yeni çerçeve işlendiyse True; geride kalınırsa en yeni çerçeveye atlanır, maliyet çağrı başına sınırlıdır
+        head = tap.head
+        if self.pos is None or head - self.pos > self.size + self.MAX_FRAMES * self.hop:
+            self.pos = max(0, head - self.size)
+        ready = False
+        while self.pos + self.size <= head:
+            started = time.perf_counter()
+            tap.read(self.pos + self.size, self.frame)
+            np.multiply(self.frame, self.win, out=self.frame)
+            np.abs(np.fft.rfft(self.frame), out=self.scratch)
+            np.multiply(self.scratch, self.scratch, out=self.scratch)
+            # İlk çerçevelerde gerçek ortalama, sonra üstel ortalama
+            self.frames += 1
+            np.subtract(self.scratch, self.power, out=self.scratch)
+            np.multiply(self.scratch, 1.0 / min(self.frames, self.averages), out=self.scratch)
+            np.add(self.power, self.scratch, out=self.power)
+            self.pos += self.hop; ready = True
+            self.frame_time = time.perf_counter() - started
+        return ready
+
+    def levels_db(self):
+        # Sinüs genliği A için tepe A dBFS verir
+        return 10 * np.log10(self.power * self.norm ** 2 + 1e-20)
+
+    def harmonics(self, f0, sample_rate, count=10):
+        # Her harmoniğin gücü, Hann ana lobu (±2 kutu) üzerinden toplanır
+        k0 = f0 * self.size / sample_rate
+        if k0 < 3 or not self.frames: return [], None
+        levels = []
+        for n in range(1, count + 1):
+            k = int(round(n * k0))
+            if k + 3 > self.power.size: break
+            levels.append(self.power[k - 2:k + 3].sum())
+        if not levels or levels[0] <= 0: return [], None
+        levels = np.array(levels)
+        dbc = 10 * np.log10(levels / levels[0] + 1e-20)
+        thd = 100 * np.sqrt(levels[1:].sum() / levels[0])
+        return [(n + 1, (n + 1) * f0, dbc[n]) for n in range(len(levels))], thd
+
+class AudioStats:
+    # Sabit boyutlu sayaçlar ve histogramlar; çalışma süresi ne olursa olsun bellek sabit kalır
+    RENDER_EDGES_US = (25, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+    FILL_BINS = 10
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.started = time.monotonic()
+        self.blocks = 0; self.rendered = 0
+        self.render_total = 0.0; self.render_max = 0.0; self.render_last = 0.0
+        self.render_hist = [0] * (len(self.RENDER_EDGES_US) + 1)
+        self.reads = 0; self.requested = 0; self.delivered = 0; self.silence = 0
+        self.ring_underruns = 0; self.device_underruns = 0
+        self.ring_fill_hist = [0] * self.FILL_BINS
+        self.device_fill_hist = [0] * self.FILL_BINS
+        self.state = "Stopped"
+        self.state_counts = {}
+        self.transitions = deque(maxlen=64)
+        self.clock = None
+
+    def fill_bin(self, fraction):
+        return min(self.FILL_BINS - 1, max(0, int(fraction * self.FILL_BINS)))
+
+    def record_render(self, samples, seconds):
+        us = seconds * 1e6
+        self.blocks += 1; self.rendered += samples
+        self.render_total += seconds; self.render_last = us
+        if us > self.render_max: self.render_max = us
+        self.render_hist[bisect.bisect_right(self.RENDER_EDGES_US, us)] += 1
+
+    def record_read(self, requested, delivered, silence, ring_fill):
+        self.reads += 1; self.requested += requested; self.delivered += delivered
+        if silence:
+            self.silence += silence; self.ring_underruns += 1
+        if ring_fill is not None: self.ring_fill_hist[self.fill_bin(ring_fill)] += 1
+
+    def record_device_fill(self, fraction):
+        self.device_fill_hist[self.fill_bin(fraction)] += 1
+
+    def record_state(self, state, error):
+        if error == "Underrun": self.device_underruns += 1
+        self.state = state
+        self.state_counts[state] = self.state_counts.get(state, 0) + 1
+        self.transitions.append((round(time.monotonic() - self.started, 3), state, error))
+
+    def record_clock(self, mode, virtual, wall, busy, misses):
+        # Boş çıkışın sanal saati: üretilen ses süresi, geçen duvar saati ve kaçırılan son tarihler
+        self.clock = (mode, virtual, wall, busy, misses)
+
+    def summary_lines(self):
+        mean = self.render_total / self.blocks * 1e6 if self.blocks else 0.0
+        rate = self.rendered / self.render_total if self.render_total else 0.0
+        lines = [f"render  {self.blocks} blk  mean {mean:.0f} us  max {self.render_max:.0f} us  {rate / 1e6:.1f} MS/s",
+                f"bytes   req {self.requested}  out {self.delivered}  silence {self.silence}",
+                f"underrun ring {self.ring_underruns}  device {self.device_underruns}  state {self.state}",
+                f"ring fill   {' '.join(str(v) for v in self.ring_fill_hist)}",
+                f"device fill {' '.join(str(v) for v in self.device_fill_hist)}"]
+        if self.clock is not None:
+            mode, virtual, wall, busy, misses = self.clock
+            lines.append(f"null {mode}  {virtual:.2f} s in {wall:.2f} s  RTF {virtual / wall if wall else 0:.2f}  misses {misses}")
+        return lines
+
+    def to_dict(self):
+        return {'uptime_s': round(time.monotonic() - self.started, 3),
+                'render': {'blocks': self.blocks, 'samples': self.rendered, 'total_s': self.render_total,
+                           'max_us': self.render_max, 'last_us': self.render_last,
+                           'histogram_edges_us': list(self.RENDER_EDGES_US), 'histogram': list(self.render_hist)},
+                'io': {'reads': self.reads, 'requested_bytes': self.requested, 'delivered_bytes': self.delivered,
+                       'silence_bytes': self.silence},
+                'underruns': {'ring': self.ring_underruns, 'device': self.device_underruns},
+                'fill_histogram_bins': self.FILL_BINS,
+                'ring_fill_histogram': list(self.ring_fill_hist), 'device_fill_histogram': list(self.device_fill_hist),
+                'state': self.state, 'state_counts': dict(self.state_counts),
+                'transitions': [list(t) for t in self.transitions],
+                'virtual_clock': None if self.clock is None else dict(zip(("mode", "audio_s", "wall_s", "pull_s", "deadline_misses"), self.clock))}
+
+class LatencyController:
+    # profil: (en küçük ms, en büyük ms, izin verilen kesinti/dakika, küçültmeden önce sessiz saniye)
+    PROFILES = OrderedDict([("Low latency", (10, 160, 1.0, 10)), ("Safe", (60, 500, 0.1, 60))])
+    GROW = 1.5; SHRINK = 0.8
+
+    def __init__(self, profile="Safe"):
+        self.set_profile(profile)
+
+    def set_profile(self, profile):
+        self.profile = profile
+        self.min_ms, self.max_ms, self.target_rate, self.quiet_after = self.PROFILES[profile]
+        self.buffer_ms = self.min_ms
+        self.reset()
+
+    def reset(self):
+        self.window = deque(maxlen=60); self.last = None; self.quiet = 0
+
+    def notify_ms(self):
+        return max(5, int(self.buffer_ms) // 4)
+
+    def buffer_bytes(self, sample_rate, frame_bytes):
+        return int(sample_rate * self.buffer_ms / 1000) * frame_bytes
+
+    def update(self, underruns, seconds=1.0):
+        # Kümülatif kesinti sayısını alır; tampon değişmesi gerekiyorsa True döner
+        delta = 0 if self.last is None else underruns - self.last
+        self.last = underruns
+        self.window.append(delta)
+        rate = sum(self.window) * 60.0 / (len(self.window) * seconds)
+        if delta and rate > self.target_rate and self.buffer_ms < self.max_ms:
+            self.buffer_ms = min(self.max_ms, self.buffer_ms * self.GROW)
+            self.window.clear(); self.quiet = 0
+            return True
+        self.quiet = 0 if delta else self.quiet + seconds
+        if self.quiet >= self.quiet_after and self.buffer_ms > self.min_ms:
+            self.buffer_ms = max(self.min_ms, self.buffer_ms * self.SHRINK)
+            self.quiet = 0
+            return True
+        return False
+
+class NullAudioOutput(QObject):
+    # Ses donanımı olmayan makineler için QAudioOutput yerine geçer; cihazı sanal bir saatle çeker.
+    # realtime: model tampon gerçek zamanla boşalır, dolmadan boşalırsa son tarih kaçmış sayılır; fast: olabildiğince hızlı
+    ActiveState, SuspendedState, StoppedState, IdleState, InterruptedState = range(5)
+    NoError, OpenError, IOError, UnderrunError, FatalError = range(5)
+    CLOCKS = ("realtime", "fast")
+    FAST_SLICE = 0.02
+    stateChanged = pyqtSignal(int)
+    notify = pyqtSignal()
+
+    def __init__(self, sample_rate, frame_bytes, clock="realtime", parent=None):
+        super().__init__(parent)
+        self.sample_rate, self.frame_bytes, self.clock = sample_rate, frame_bytes, clock
+        self.buffer_size = 0
+        self.notify_ms = 1000
+        self.device = None
+        self.current = self.StoppedState
+        self.last_error = self.NoError
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.pump)
+        self.reset_clock()
+
+    def reset_clock(self):
+        self.written = 0; self.gap = 0; self.level = 0
+        self.busy = 0.0; self.misses = 0
+        self.started = self.notified = time.perf_counter()
+        self.stopped = None
+
+    def setBufferSize(self, size): self.buffer_size = size
+    def bufferSize(self): return self.buffer_size or int(self.sample_rate * 0.1) * self.frame_bytes
+    def setNotifyInterval(self, ms): self.notify_ms = ms
+    def notifyInterval(self): return self.notify_ms
+    def bytesFree(self): return max(0, self.bufferSize() - self.level)
+    def periodSize(self): return self.bufferSize() // 4
+    def state(self): return self.current
+    def error(self): return self.last_error
+    def processedUSecs(self): return int(self.written // self.frame_bytes * 1e6 / self.sample_rate)
+
+    def set_state(self, state):
+        self.current = state
+        self.stateChanged.emit(state)
+
+    def start(self, device):
+        self.device = device
+        self.reset_clock()
+        self.last_error = self.NoError
+        self.set_state(self.ActiveState)
+        if self.clock == "realtime":
+            # Saat ilk doldurmadan sonra başlar (Qt da tampon dolunca çalmaya başlar); ilk çekme son tarih kaçırmaz
+            self.pull(self.bufferSize())
+            self.started = self.notified = time.perf_counter()
+        buffer_ms = self.bufferSize() / self.frame_bytes * 1000 / self.sample_rate
+        self.timer.start(0 if self.clock == "fast" else max(1, int(buffer_ms / 4)))
+        self.pump()
+
+    def stop(self):
+        if self.device is None: return
+        self.timer.stop()
+        self.device = None
+        self.stopped = time.perf_counter()
+        self.set_state(self.StoppedState)
+
+    def pull(self, size):
+        size -= size % self.frame_bytes
+        started = time.perf_counter()
+        while size > 0:
+            data = self.device.read(size)
+            if not data: break
+            self.written += len(data); size -= len(data)
+        self.busy += time.perf_counter() - started
+
+    def pump(self):
+        if self.device is None: return
+        now = time.perf_counter()
+        size = self.bufferSize()
+        if self.clock == "fast":
+            # Son tarih yok: kısa dilimlerde çekilir, arada olay döngüsü UI değişikliklerini işler
+            stop = now + self.FAST_SLICE
+            while time.perf_counter() < stop: self.pull(size)
+            self.level = 0
+        else:
+            played = int((now - self.started) * self.sample_rate) * self.frame_bytes
+            self.level = self.written + self.gap - played
+            if self.level < 0:
+                # Sanal DAC boş tamponla karşılaştı: sessizlik çalmış sayılır, Qt gibi Idle/Underrun bildirilir
+                self.misses += 1; self.gap -= self.level; self.level = 0
+                self.last_error = self.UnderrunError; self.set_state(self.IdleState)
+                self.last_error = self.NoError; self.set_state(self.ActiveState)
+            self.pull(size - self.level)
+            self.level = self.written + self.gap - played
+        if (now - self.notified) * 1000 >= self.notify_ms:
+            self.notified = now
+            self.notify.emit()
+
+    def report(self):
+        # (saat kipi, üretilen ses saniyesi, duvar saati saniyesi, çekmede geçen saniye, kaçırılan son tarih)
+        wall = (self.stopped or time.perf_counter()) - self.started
+        return self.clock, self.written / self.frame_bytes / self.sample_rate, wall, self.busy, self.misses
+
+class AudioProducer(threading.Thread):
+    def __init__(self, generator, ring, block):
+        super().__init__(daemon=True)
+        self.generator = generator
+        self.ring = ring
+        self.block = block
+        self.size = block * generator.channels
+        self.wake = threading.Event()
+        self.running = True
+
+    def run(self):
+        while self.running:
+            self.wake.clear()
+            # Halka hedef doluluğun ötesine doldurulmaz; önde tutulan süre gecikmeye eklenir
+            if self.ring.fill() + self.size <= self.generator.ring_target:
+                self.ring.write(self.generator.render(self.block))
+            else:
+                self.wake.wait(0.005)
+
+    def stop(self):
+        self.running = False
+        self.wake.set()
+        self.join()
+
 class AudioGenerator(QIODevice):
-    def __init__(self, format, parent=None):
+    MAX_BLOCK = 16384
+    # Halka en büyük cihaz tamponunu (gecikme profillerinin üst sınırı) pay ile karşılar; süreler örnekleme hızından bağımsızdır
+    RING_MS = max(profile[1] for profile in LatencyController.PROFILES.values()) + 100
+    RING_TARGET_MS = 46
+    PRODUCER_BLOCK = 256
+    CHANNEL_MODES = ("Mono", "Stereo", "I/Q")
+
+    def __init__(self, format=None, parent=None, sample_rate=44100, channel_mode="Mono", dtype=np.int16):
         super().__init__(parent)
+        self.phase = 0.0
+        self.params = WaveParams()
+        self.mixer = None
+        self.sweep = None
+        self.requested_sweep = None
+        self.modulation = None
+        self.noise = NoiseSource()
+        self.tap = ScopeTap()
+        self.block_freq = self.params.freq
+        self.producer = None
+        self.stats = AudioStats()
+        self.measure = None
+        self.ring_ms = self.RING_TARGET_MS
+        self.configure(format, sample_rate, channel_mode, dtype)
+
+    def configure(self, format=None, sample_rate=44100, channel_mode="Mono", dtype=np.int16):
+        # format yoksa (çevrimdışı işleme) verilen hız ve örnek tipi kullanılır; 32 bit örnek float32 demektir
         self.format = format
-        self.phase = 0
-        self.frequency = 440
-        self.amp_pos = 0.05
-        self.amp_neg = 0.05
-        self.is_asymmetric = False
-        self.wave_type = "Sine"
-        self.duty_cycle = 0.5
-        self.rectification = "Full"
-        self.sample_rate = format.sampleRate()
-
-    def start(self):
+        if format is not None:
+            sample_rate = format.sampleRate()
+            dtype = np.float32 if format.sampleSize() == 32 else np.int16
+        self.sample_rate = sample_rate
+        self.channel_mode = channel_mode
+        self.channels = 1 if channel_mode == "Mono" else 2
+        # I/Q modunda ikinci satır dördün (quadrature) fazıyla aynı blokta sentezlenir
+        self.rows = 2 if channel_mode == "I/Q" else 1
+        self.dtype = np.dtype(dtype)
+        self.frame_bytes = self.channels * self.dtype.itemsize
+        self.reserve(self.MAX_BLOCK)
+        # Üretici bloğu 44.1 kHz'de 256 örnek; yüksek hızlarda aynı süreye yakın ikinin kuvveti, düşük hızlarda 256'nın altına inmez
+        self.producer_block = self.PRODUCER_BLOCK << max(0, int(round(np.log2(self.sample_rate / 44100))))
+        frames = int(self.sample_rate * self.RING_MS / 1000) + self.producer_block
+        self.ring = SampleRing(frames * self.channels, self.dtype)
+        self.out = np.empty(frames * self.channels, dtype=self.dtype)
+        self.set_ring_target(self.ring_ms)
+        if self.measure is not None: self.measure = StreamMeasurements(self.sample_rate)
+
+    def set_ring_target(self, ms):
+        # Üretici en az bir cihaz tamponu kadar önde kalır; çalarken de değiştirilebilir (tek tamsayı ataması)
+        self.ring_ms = ms
+        frames = int(self.sample_rate * max(ms, self.RING_TARGET_MS) / 1000) + self.producer_block
+        self.ring_target = min(frames, self.ring.capacity // self.channels) * self.channels
+
+    def reserve(self, samples):
+        # Tamponlar bir kez ayrılır; yalnızca daha büyük bir blok istenirse büyür
+        n = samples * self.rows
+        self.capacity = samples
+        self.ramp = np.arange(samples, dtype=np.float64)
+        self.ph64 = np.empty(n, dtype=np.float64)
+        self.floor64 = np.empty(n, dtype=np.float64)
+        self.ph = np.empty(n, dtype=np.float32)
+        self.buf = np.empty(n, dtype=np.float32)
+        self.work = np.empty(n, dtype=np.float32)
+        self.idx = np.empty(n, dtype=np.int32)
+        # PWM: gecikmeli testere fazı, ikinci testere ve örnek başına görev döngüsü
+        self.ph2 = np.empty(n, dtype=np.float32)
+        self.saw = np.empty(n, dtype=np.float32)
+        self.duty = np.empty(n, dtype=np.float32)
+        self.pcm = np.empty(samples * self.channels, dtype=self.dtype)
+
+    def start(self, threaded=True):
+        # threaded=False: üretici iş parçacığı olmadan, readData her çağrıda doğrudan sentezler
+        if not threaded:
+            self.open(QIODevice.ReadOnly)
+            return
+        # Halka, Qt ilk kez çekmeden önce GUI iş parçacığında doldurulur
+        self.ring = SampleRing(self.ring.capacity, self.dtype)
+        block = self.producer_block
+        while self.ring.fill() + block * self.channels <= self.ring_target:
+            self.ring.write(self.render(block))
+        self.producer = AudioProducer(self, self.ring, block)
+        self.producer.start()
         self.open(QIODevice.ReadOnly)
 
     def stop(self):
         self.close()
+        if self.producer is not None:
+            self.producer.stop(); self.producer = None
+
+    def set_sweep(self, sweep):
+        # GUI yalnızca isteği yayınlar (tek referans ataması); geçişi üretici bir sonraki bloğun başında yapar
+        self.requested_sweep = sweep
+
+    def advance_phase(self, samples, p, fm=None, deviation=0.0):
+        # Faz akümülatörü: döngü kesri [0, 1) aralığında tutulur, frekans değişiminde sıçrama olmaz
+        ph64 = self.ph64[:samples]
+        sweep = self.requested_sweep
+        if sweep is not self.sweep:
+            # Tarama başlarken ve biterken faz sürekliliği korunur; faz ve tarama durumu yalnızca burada el değiştirir
+            if self.sweep is not None: self.phase = self.sweep.current_phase()
+            if sweep is not None: sweep.base = self.phase
+            self.sweep = sweep
+        if sweep is not None:
+            self.block_freq = sweep.advance(samples, self.ramp, ph64)
+        elif fm is not None:
+            # FM: örnek başına artım (fc + sapma*m)/sr; faz, artımların dışlayıcı kümülatif toplamıdır
+            inc = self.floor64[:samples]
+            np.multiply(fm, deviation / self.sample_rate, out=inc)
+            np.add(inc, p.freq / self.sample_rate, out=inc)
+            np.cumsum(inc, out=ph64)
+            np.subtract(ph64, inc, out=ph64)
+            np.add(ph64, self.phase, out=ph64)
+            self.phase = (ph64[-1] + inc[-1]) % 1.0
+            np.subtract(ph64, np.floor(ph64, out=inc), out=ph64)
+            self.block_freq = abs(p.freq) + abs(deviation)
+        else:
+            frequency = p.freq
+            if p.w_type == "Arbitrary" and p.awg is not None:
+                frequency = p.awg.frequency(self.sample_rate, frequency)
+            inc = frequency / self.sample_rate
+            np.multiply(self.ramp[:samples], inc, out=ph64)
+            np.add(ph64, self.phase, out=ph64)
+            np.subtract(ph64, np.floor(ph64, out=self.floor64[:samples]), out=ph64)
+            self.phase = (self.phase + inc * samples) % 1.0
+            self.block_freq = frequency
+        if self.rows == 2:
+            q = self.ph64[samples:2 * samples]
+            np.add(ph64, 0.25, out=q)
+            np.subtract(q, np.floor(q, out=self.floor64[samples:2 * samples]), out=q)
+            ph64 = self.ph64[:2 * samples]
+        ph = self.ph[:ph64.size]
+        np.copyto(ph, ph64, casting="same_kind")
+        return ph
+
+    def pulse(self, ph, out, p, pwm, depth):
+        # pulse = 2d - 1 - (s(p) - s(p - d)); band-limited testerelerin farkı, d örnek başına değişir
+        frames, n = pwm.size, out.size
+        duty, ph2, saw = self.duty[:n], self.ph2[:n], self.saw[:n]
+        np.multiply(pwm, depth, out=duty[:frames], casting="same_kind")
+        np.add(duty[:frames], p.duty, out=duty[:frames]); np.clip(duty[:frames], 0.01, 0.99, out=duty[:frames])
+        if n > frames: duty[frames:] = duty[:frames]
+        np.subtract(ph, duty, out=ph2)
+        np.less(ph2, 0, out=saw); np.add(ph2, saw, out=ph2)
+        tables, diffs = WAVETABLES.get("Saw")
+        level = WAVETABLES.level(self.block_freq, self.sample_rate)
+        WAVETABLES.read(tables[level], diffs[level], ph, out, self.work[:n], self.idx[:n])
+        WAVETABLES.read(tables[level], diffs[level], ph2, saw, self.work[:n], self.idx[:n])
+        np.subtract(out, saw, out=out)
+        np.multiply(duty, 2, out=saw); np.subtract(saw, 1, out=saw)
+        np.subtract(saw, out, out=out)
+        np.multiply(out, WAVETABLES.pulse_gains()[level], out=out)
+        return out
+
+    def shape(self, ph, out, p, pwm=None, depth=0.0):
+        if pwm is not None and p.w_type == "Square":
+            return self.pulse(ph, out, p, pwm, depth)
+        if p.w_type in NoiseSource.TYPES:
+            # Gürültünün dördün fazı yoktur; I/Q'da iki satır aynı bloğu taşır
+            frames = out.size // self.rows
+            self.noise.render(p.w_type, out[:frames], self.sample_rate)
+            if self.rows == 2: out[frames:] = out[:frames]
+            return out
+        if p.w_type == "Arbitrary" and p.awg is not None:
+            return p.awg.read(self.ph64[:out.size], out, self.work[:out.size])
+        tables, diffs = WAVETABLES.get(p.w_type, p.duty)
+        level = WAVETABLES.level(self.block_freq, self.sample_rate)
+        return WAVETABLES.read(tables[level], diffs[level], ph, out, self.work[:out.size], self.idx[:out.size])
+
+    def render_oscillator(self, samples, p):
+        # Modülatör blok başına bir kez ilerletilir; türüne göre faza, dalga şekline ya da genliğe uygulanır.
+        # Blok boyunca yakalanan nesne kullanılır; GUI arada modülasyonu kapatsa da üretici iş parçacığı etkilenmez
+        mod = self.modulation
+        m = mod.advance(samples) if mod is not None else None
+        kind = mod.kind if mod is not None else None
+        depth = mod.depth if mod is not None else 0.0
+        ph = self.advance_phase(samples, p, m if kind == "FM" else None, depth)
+        y = self.shape(ph, self.buf[:ph.size], p, m if kind == "PWM" else None, depth)
+
+        if p.rect == "Half":
+            np.maximum(y, 0, out=y)
+
+        if p.is_asym:
+            # Kazanç = amp_neg + (amp_pos - amp_neg) * (y >= 0)
+            gain = self.work[:y.size]
+            np.greater_equal(y, 0, out=gain)
+            np.multiply(gain, p.amp_p - p.amp_n, out=gain)
+            np.add(gain, p.amp_n, out=gain)
+            np.multiply(y, gain, out=y)
+        else:
+            np.multiply(y, p.amp_p, out=y)
+
+        if kind == "AM":
+            # Zarf (1 + k*m) / (1 + k): tepe genlik taşmaz, k = 1'de tam modülasyon
+            env = self.work[:samples]
+            np.multiply(m, mod.depth / (1 + mod.depth), out=env, casting="same_kind")
+            np.add(env, 1 / (1 + mod.depth), out=env)
+            np.multiply(y.reshape(self.rows, samples), env, out=y.reshape(self.rows, samples))
+        return y
+
+    def render(self, samples):
+        started = time.perf_counter()
+        if samples > self.capacity: self.reserve(samples)
+        mixer = self.mixer
+        if mixer is not None and mixer.oscillators and mixer.rows == self.rows:
+            y = mixer.render(samples, self.buf[:samples * self.rows].reshape(self.rows, samples))
+        else:
+            # Blok boyunca tek bir görüntü kullanılır; GUI arada yenisini atasa da yarım güncelleme görülmez
+            y = self.render_oscillator(samples, self.params).reshape(self.rows, samples)
+
+        # Band-limited kenarlardaki Gibbs aşımı int16 taşmasına yol açmasın
+        np.clip(y, -1, 1, out=y)
+        self.tap.write(y[0])
+        measure = self.measure
+        if measure is not None: measure.update(y[0])
+        if self.dtype == np.int16: np.multiply(y, 32767, out=y)
+        # Satırlar (frames, channels) görünümüne tek kopyayla serpiştirilir; Stereo'da tek satır iki kanala yayılır
+        pcm = self.pcm[:samples * self.channels]
+        np.copyto(pcm.reshape(samples, self.channels).T, y, casting="unsafe")
+        self.stats.record_render(samples, time.perf_counter() - started)
+        return pcm
 
     def readData(self, maxlen):
-        samples = maxlen // (self.format.sampleSize() // 8)
+        samples = maxlen // self.frame_bytes
         if samples <= 0: return b""
-            
-        t = np.arange(samples) + self.phase
-        self.phase += samples
-        v = t * 2 * np.pi * self.frequency / self.sample_rate
-        
-        if self.wave_type == "Sine":
-            y = np.sin(v)
-        elif self.wave_type == "Square":
-            y = np.where(np.mod(v, 2 * np.pi) < 2 * np.pi * self.duty_cycle, 1, -1)
-        elif self.wave_type == "Triangle":
-            y = 2 * np.abs(2 * (v / (2 * np.pi) - np.floor(v / (2 * np.pi) + 0.5))) - 1
-        
-        if self.rectification == "Half":
-            y = np.maximum(0, y)
+        # PyQt5 readData yalnızca bytes kabul ediyor; bloktaki tek kopya budur
+        if self.producer is None:
+            self.stats.record_read(maxlen, samples * self.frame_bytes, 0, None)
+            return self.render(samples).tobytes()
+        out = self.out[:min(samples * self.channels, self.ring.capacity)]
+        fill = self.ring.fill() / self.ring_target
+        got = self.ring.read(out)
+        self.producer.wake.set()
+        silence = 0
+        if got == 0:
+            # Üretici geride kaldı: sessizlik ver, Qt boş dönünce durmasın
+            got = silence = min(out.size, self.producer_block * self.channels)
+            out[:got] = 0
+        size = self.dtype.itemsize
+        self.stats.record_read(maxlen, got * size, silence * size, fill)
+        return out[:got].tobytes()
 
-        if self.is_asymmetric:
-            y = np.where(y >= 0, y * self.amp_pos, y * self.amp_neg)
-        else:
-            y = y * self.amp_pos
+def render_offline(generator, stream, seconds, container="wav", chunk=8192):
+    # Sabit boyutlu bloklar halinde yazılır; bellek kullanımı süreden bağımsızdır
+    total = int(round(seconds * generator.sample_rate))
+    if container == "wav":
+        wav = wave.open(stream, "wb")
+        wav.setnchannels(generator.channels); wav.setsampwidth(generator.dtype.itemsize); wav.setframerate(generator.sample_rate)
+        wav.setnframes(total)
+        write = wav.writeframesraw
+    else:
+        wav = None; write = stream.write
+    done = 0
+    while done < total:
+        n = min(chunk, total - done)
+        write(generator.render(n))
+        done += n
+    if wav is not None: wav.close()
+    return done
+
+def parse_tone(spec):
+    # WAVE:HZ:AMP[:DUTY] -> osilatör parametreleri (yüzdeler UI sürgüleriyle aynı)
+    parts = spec.split(":")
+    if len(parts) not in (3, 4) or parts[0] not in ("Sine", "Square", "Triangle"):
+        raise argparse.ArgumentTypeError(f"invalid tone '{spec}', expected WAVE:HZ:AMP[:DUTY]")
+    amp = int(parts[2]) / 100.0
+    return WaveParams(w_type=parts[0], freq=float(parts[1]), amp_p=amp, amp_n=amp,
+                      duty=int(parts[3]) / 100.0 if len(parts) == 4 else 0.5)
+
+def parse_modulation(spec):
+    # KIND:SHAPE:RATE:DEPTH -> derinlik AM/PWM için yüzde, FM için Hz
+    parts = spec.split(":")
+    if len(parts) != 4 or parts[0] not in Modulation.KINDS or parts[1] not in Modulation.SHAPES:
+        raise argparse.ArgumentTypeError(f"invalid modulation '{spec}', expected AM|FM|PWM:SHAPE:HZ:DEPTH")
+    try: rate, depth = float(parts[2]), float(parts[3])
+    except ValueError: raise argparse.ArgumentTypeError(f"invalid modulation '{spec}', rate and depth must be numbers")
+    return parts[0], parts[1], rate, depth if parts[0] == "FM" else depth / 100.0
+
+def render_main(argv):
+    parser = argparse.ArgumentParser(prog="wavegen.py", description="Render QSignal Generator output to a file without a display or sound device.")
+    parser.add_argument("--render", required=True, metavar="FILE", help="output file, '-' for stdout")
+    parser.add_argument("--duration", type=float, required=True, metavar="SECONDS")
+    parser.add_argument("--freq", type=float, default=440.0, metavar="HZ")
+    parser.add_argument("--wave", choices=["Sine", "Square", "Triangle", "Arbitrary"] + list(NoiseSource.TYPES), default="Sine")
+    parser.add_argument("--rect", choices=["Full", "Half"], default="Full")
+    parser.add_argument("--amp", type=int, default=5, metavar="PERCENT")
+    parser.add_argument("--amp-neg", type=int, default=5, metavar="PERCENT")
+    parser.add_argument("--asym", action="store_true")
+    parser.add_argument("--duty", type=int, default=50, metavar="PERCENT")
+    parser.add_argument("--rate", type=int, default=44100, metavar="HZ")
+    parser.add_argument("--channels", choices=list(AudioGenerator.CHANNEL_MODES), default="Mono", help="Stereo duplicates the signal, I/Q adds a 90° channel")
+    parser.add_argument("--seed", type=int, help="noise generator seed for reproducible output")
+    parser.add_argument("--sample-type", choices=["int16", "float32"], default="int16", help="float32 needs --format raw")
+    parser.add_argument("--format", choices=["wav", "raw"], help="default: raw for .raw/.pcm, wav otherwise")
+    parser.add_argument("--chunk", type=int, default=8192, metavar="SAMPLES")
+    parser.add_argument("--tone", type=parse_tone, action="append", metavar="WAVE:HZ:AMP[:DUTY]", help="mixer oscillator, repeat for multi-tone output")
+    parser.add_argument("--headroom", type=float, default=6.0, metavar="DB", help="mixer headroom")
+    parser.add_argument("--clip", choices=["Hard", "Soft"], default="Hard", help="mixer clipping")
+    parser.add_argument("--sweep", metavar="START:STOP:SECONDS", help="frequency sweep instead of a fixed --freq")
+    parser.add_argument("--mod", type=parse_modulation, metavar="KIND:SHAPE:HZ:DEPTH", help="AM/PWM depth in percent, FM deviation in Hz; PWM needs --wave Square")
+    parser.add_argument("--sweep-mode", choices=["Linear", "Log"], default="Linear")
+    parser.add_argument("--sweep-repeat", action="store_true")
+    parser.add_argument("--awg", metavar="FILE", help="arbitrary waveform file (WAV, CSV, raw) for --wave Arbitrary")
+    parser.add_argument("--awg-dtype", choices=["int16", "float32"], help="sample type of a raw --awg file")
+    parser.add_argument("--awg-native", choices=["yes", "no"], help="play --awg at its own rate instead of --freq (default: WAV and long raw files)")
+    args = parser.parse_args(argv)
+    for name in ("duration", "rate", "chunk"):
+        if getattr(args, name) <= 0: parser.error(f"--{name} must be positive")
+
+    gen = AudioGenerator(sample_rate=args.rate, channel_mode=args.channels, dtype=np.dtype(args.sample_type))
+    gen.noise = NoiseSource(args.seed)
+    container = args.format or ("raw" if args.render.lower().endswith((".raw", ".pcm")) else "wav")
+    if container == "wav" and args.sample_type == "float32":
+        parser.error("float32 samples are only written with --format raw")
+    awg = None
+    if args.awg:
+        try: awg = ArbitraryWave.load(args.awg, args.awg_dtype, None if args.awg_native is None else args.awg_native == "yes")
+        except (OSError, ValueError) as e: parser.error(f"cannot load {args.awg}: {e}")
+    elif args.wave == "Arbitrary":
+        parser.error("--wave Arbitrary needs --awg FILE")
+    gen.params = WaveParams(freq=args.freq, w_type=args.wave, rect=args.rect, amp_p=args.amp / 100.0, amp_n=args.amp_neg / 100.0,
+                            is_asym=args.asym, duty=args.duty / 100.0, awg=awg)
+    if args.mod: gen.modulation = Modulation(*args.mod, sample_rate=args.rate)
+    if args.tone: gen.mixer = OscillatorBank(args.tone, args.rate, args.headroom, args.clip, quadrature=gen.rows == 2)
+    if args.sweep:
+        try: start, stop, seconds = (float(v) for v in args.sweep.split(":"))
+        except ValueError: parser.error(f"invalid sweep '{args.sweep}', expected START:STOP:SECONDS")
+        gen.set_sweep(FrequencySweep(start, stop, seconds, args.sweep_mode, args.sweep_repeat, args.rate))
+    if args.render == "-":
+        render_offline(gen, sys.stdout.buffer, args.duration, container, args.chunk)
+        sys.stdout.buffer.flush()
+    else:
+        with open(args.render, "wb") as f:
+            render_offline(gen, f, args.duration, container, args.chunk)
+    return 0
 
-        y = (y * 32767).astype(np.int16)
-        return y.tobytes()
+def make_polyline(xs, ys):
+    # Noktalar QPolygonF'in kendi belleğine tek seferde yazılır (qreal = double)
+    poly = QPolygonF(len(xs))
+    ptr = poly.data(); ptr.setsize(len(xs) * 16)
+    pts = np.frombuffer(ptr, dtype=np.float64).reshape(-1, 2)
+    pts[:, 0] = xs; pts[:, 1] = ys
+    return poly
+
+def column_spans(xs, ys):
+    # Sütun başına ışının taradığı dikey aralık; komşu sütunlara kadar uzatılan aralıklar izi boşluksuz yapar
+    cols = xs.astype(np.intp)
+    starts = np.flatnonzero(np.r_[True, cols[1:] != cols[:-1]])
+    lo, hi, cols = np.minimum.reduceat(ys, starts), np.maximum.reduceat(ys, starts), cols[starts]
+    lo[1:], hi[1:] = np.minimum(lo[1:], hi[:-1]), np.maximum(hi[1:], lo[:-1])
+    return cols, lo, hi
+
+def make_spans(xs, ys):
+    # drawLines için nokta çiftleri: her sütuna bir dikey çizgi; en az bir piksel boyunda
+    cols, lo, hi = column_spans(xs, ys)
+    x = cols + 0.5
+    return make_polyline(np.repeat(x, 2), np.column_stack((lo, np.maximum(hi, lo + 1))).ravel())
+
+class PhosphorRaster:
+    # Analog tüp görünümü: iz, float birikim tamponuna ışın enerjisi olarak yazılır ve üstel olarak söner.
+    # Ekrana ARGB32 tamponunu kopyalamadan saran QImage basılır; kare maliyeti iz karmaşıklığına değil piksel sayısına bağlıdır.
+    def __init__(self, color=QColor(57, 255, 20), persistence=0.15):
+        self.persistence = persistence
+        i = np.arange(256, dtype=np.uint32)
+        self.lut = (i << 24) | ((i * color.red() // 255) << 16) | ((i * color.green() // 255) << 8) | (i * color.blue() // 255)
+        self.size = None
+        self.held = None
+        self.last = None
+
+    def resize(self, w, h):
+        self.size = (w, h)
+        self.acc = np.zeros((h, w), dtype=np.float32)
+        self.tmp = np.empty((h, w), dtype=np.float32)
+        self.above = np.empty((h, w), dtype=bool)
+        self.below = np.empty((h, w), dtype=bool)
+        self.rows = np.arange(h, dtype=np.float32)[:, None]
+        self.lo = np.empty(w, dtype=np.float32)
+        self.hi = np.empty(w, dtype=np.float32)
+        self.weight = np.empty(w, dtype=np.float32)
+        self.level = np.empty((h, w), dtype=np.uint8)
+        self.argb = np.zeros((h, w), dtype=np.uint32)
+        # QImage yalnızca argb belleğini gösterir; tampon yeniden ayrılana kadar aynı nesne kullanılır
+        self.image = QImage(self.argb.data, w, h, w * 4, QImage.Format_ARGB32_Premultiplied)
+        self.held = None
+        self.last = None
+
+    def clear(self):
+        self.acc.fill(0)
+        self.last = None
+
+    def decay(self, now):
+        # Sönüm gerçek kare süresine göre; FPS değişse de kalıcılık süresi aynı kalır
+        dt = 0.0 if self.last is None else min(now - self.last, 0.25)
+        self.last = now
+        np.multiply(self.acc, np.float32(np.exp(-dt / self.persistence)), out=self.acc)
+
+    def deposit(self, xs, ys, energy=1.0):
+        # Hızlı geçen ışın (uzun aralık) daha sönük iz bırakır
+        w, h = self.size
+        cols, lo, hi = column_spans(xs, ys)
+        keep = (cols >= 0) & (cols < w)
+        self.lo.fill(np.inf); self.hi.fill(-np.inf)
+        self.lo[cols[keep]] = lo[keep] - 0.75; self.hi[cols[keep]] = hi[keep] + 0.75
+        np.subtract(self.hi, self.lo, out=self.weight)
+        np.maximum(self.weight, 1.5, out=self.weight)
+        np.divide(0.75 * energy, self.weight, out=self.weight)
+        np.greater_equal(self.rows, self.lo, out=self.above)
+        np.less_equal(self.rows, self.hi, out=self.below)
+        np.logical_and(self.above, self.below, out=self.above)
+        np.multiply(self.above, self.weight, out=self.tmp)
+        np.add(self.acc, self.tmp, out=self.acc)
+
+    def frame(self):
+        # Yumuşak doygunluk 1 - e^-E, ardından renk tablosundan önceden çarpılmış ARGB
+        np.negative(self.acc, out=self.tmp); np.exp(self.tmp, out=self.tmp)
+        np.subtract(1, self.tmp, out=self.tmp); np.multiply(self.tmp, 255, out=self.tmp)
+        np.copyto(self.level, self.tmp, casting="unsafe")
+        np.take(self.lut, self.level, out=self.argb)
+        return self.image
 
 class RulerSlider(QWidget):
     def __init__(self, label_text, min_val, max_val, default_val, parent=None):
@@ -89,68 +1412,607 @@ class WavePreview(QFrame):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setStyleSheet("background-color: #002b00; border: 2px solid #001a00; border-radius: 4px;")
-        self.params = {}
+        self.params = None
         self.is_frozen = False
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update)
-        self.timer.start(30)
+        self.fps = 30
+        # Zamanlayıcı yalnızca ekran canlı ve görünürken çalışır
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.tick)
         self.offset = 0
+        self.tap = None
+        self.tap_rate = 0
+        self.window_samples = None
+        self.stats = None
+        self.stats_timer = QTimer(self)
+        self.stats_timer.timeout.connect(self.update)
+        self.bg_pixmap = None
+        self.bg_key = None
+        self.trace_pixmap = None
+        self.trace_key = None
+        self.trace_base = 0.0
+        self.noise_key = None
+        self.noise_vals = None
+        self.phosphor = None
+        self.trigger = ScopeTrigger()
+        self.trigger_frac = 0.0
+        self.live_gain = 1
 
     def update_params(self, params):
         self.params = params
+        self.reschedule(); self.update()
+
+    def set_frozen(self, frozen):
+        self.is_frozen = frozen
+        self.reschedule(); self.update()
+
+    def set_source(self, tap, sample_rate):
+        # Çalarken gerçek çıkış gösterilir; tap yoksa model izine dönülür
+        self.tap, self.tap_rate = tap, sample_rate
+        self.window_samples = None
+        self.update()
+
+    def set_fps(self, fps):
+        self.fps = max(1, fps)
+        if self.timer.isActive(): self.timer.start(int(1000 / self.fps))
+
+    def set_trigger(self, trigger):
+        self.trigger = trigger
+        self.window_samples = None
+        self.update()
+
+    def set_phosphor(self, enabled):
+        self.phosphor = PhosphorRaster() if enabled else None
+        self.update()
+
+    def set_stats(self, stats):
+        # Donmuş ekranda da katman güncel kalsın diye ayrı, yavaş bir zamanlayıcı
+        self.stats = stats
+        if stats is not None: self.stats_timer.start(500)
+        else: self.stats_timer.stop()
+        self.update()
+
+    def reschedule(self):
+        win = self.window()
+        animate = self.params is not None and not self.is_frozen and self.isVisible() and not win.isMinimized()
+        if animate and not self.timer.isActive(): self.timer.start(int(1000 / self.fps))
+        elif not animate: self.timer.stop()
+
+    def tick(self):
+        handle = self.window().windowHandle()
+        if handle is not None and not handle.isExposed(): return
+        # Kaydırma hızı FPS'den bağımsız: eskiden 30 ms'de 0.2; tetiklemede model izi paintEvent'te hizalanır
+        if self.trigger.mode == "Free" or self.params.w_type in NoiseSource.TYPES:
+            self.offset += 0.2 * self.timer.interval() / 30
+        self.update()
+
+    def showEvent(self, event):
+        self.window().installEventFilter(self)
+        self.reschedule()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.reschedule()
+        super().hideEvent(event)
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.WindowStateChange: self.reschedule()
+        return False
+
+    def background(self, w, h):
+        # Izgara ve orta çizgi yalnızca boyut, DPR ya da stil değişince yeniden çizilir
+        dpr = self.devicePixelRatioF()
+        key = (w, h, dpr)
+        if self.bg_key != key:
+            pm = QPixmap(int(w * dpr), int(h * dpr)); pm.setDevicePixelRatio(dpr)
+            pm.fill(Qt.transparent)
+            painter = QPainter(pm)
+            painter.setRenderHint(QPainter.Antialiasing)
+            mid_y = h / 2
+
+            grid_pen = QPen(QColor(0, 80, 0), 1, Qt.DotLine)
+            painter.setPen(grid_pen)
+            for i in range(1, 10): painter.drawLine(0, int(h*i/10), w, int(h*i/10))
+            for i in range(1, 12): painter.drawLine(int(w*i/12), 0, int(w*i/12), h)
+
+            painter.setPen(QPen(QColor(57, 255, 20, 100), 1.5))
+            painter.drawLine(0, int(mid_y), w, int(mid_y))
+            painter.end()
+            self.bg_pixmap, self.bg_key = pm, key
+        return self.bg_pixmap
+
+    def changeEvent(self, event):
+        if event.type() in (QEvent.StyleChange, QEvent.PaletteChange):
+            self.bg_key = self.trace_key = None
+        super().changeEvent(event)
+
+    def trace(self, xs, h, freq_scale, amp_p, amp_n, is_asym, offset_val):
+        v = (xs / 50) * freq_scale + offset_val
+        val = self.model_values(v, offset_val)
+        scale_p = (h / 2.3) * np.sqrt(max(0.001, amp_p))
+        scale_n = (h / 2.3) * np.sqrt(max(0.001, amp_n)) if is_asym else scale_p
+        return h / 2 - val * np.where(val >= 0, scale_p, scale_n)
+
+    def model_values(self, v, offset_val=0.0):
+        p = self.params
+        if p.w_type == "Sine": val = np.sin(v)
+        elif p.w_type == "Square": val = np.where(np.mod(v, 2*np.pi) < 2*np.pi*p.duty, 1.0, -1.0)
+        elif p.w_type == "Arbitrary":
+            val = p.awg.values(v / (2*np.pi)) if p.awg is not None else np.zeros_like(v)
+        elif p.w_type in NoiseSource.TYPES:
+            # Her karede yeni tohum; donmuş ekranda ofset sabit kaldığı için iz de sabit kalır.
+            # Aynı tohumla ikinci iz (dual) ve donmuş yeniden boyamalar önbellekten gelir
+            key = (p.w_type, int(offset_val * 10), v.size)
+            if self.noise_key != key:
+                self.noise_vals = np.clip(NoiseSource(key[1]).render(p.w_type, np.empty(v.size, dtype=np.float32), 1000), -1, 1)
+                self.noise_key = key
+            val = self.noise_vals
+        else: val = 2 * np.abs(2 * (v / (2*np.pi) - np.floor(v / (2*np.pi) + 0.5))) - 1
+        if p.rect == "Half": val = np.maximum(0, val)
+        return val
+
+    def trigger_offset(self, w, freq_scale):
+        # Model izinde tetik: bir periyotta aynı geçiş araması, bulunan faz ekranın ortasına oturtulur
+        trig = self.trigger
+        v = np.linspace(0, 2 * np.pi, 1025)
+        x = self.model_values(v)
+        idx = ScopeTrigger.crossings(x, trig.level, trig.slope == "Rising")
+        if idx.size == 0: return None
+        i = idx[0]
+        a, b = x[i], x[i + 1]
+        phase = v[i] + (v[1] - v[0]) * ((trig.level - a) / (b - a) if b != a else 0.0)
+        return phase - (w / 2) / 50 * freq_scale
+
+    def draw_trace(self, painter, xs, h, freq_scale, color, amp_p, amp_n, is_asym, offset_val):
+        ys = self.trace(xs, h, freq_scale, amp_p, amp_n, is_asym, offset_val)
+        # İlk nokta eski QPainterPath.moveTo(0, mid_y) karşılığı
+        painter.setPen(QPen(color, 2))
+        painter.drawPolyline(make_polyline(np.r_[0, xs], np.r_[h / 2, ys]))
+
+    def draw_spans(self, painter, xs, ys, color):
+        # Sütun aralıkları tek drawLines çağrısında; 1 px kozmetik kalem, yumuşatmasız: kenar çizici devreye girmez
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing, False)
+        painter.setPen(QPen(color, 0))
+        painter.drawLines(make_spans(xs, ys))
+        painter.restore()
+
+    def cached_trace(self, w, h, freq_scale):
+        # Model izi bir periyot + genişlik boyunca bir kez çizilir; her karede yalnızca ötelenerek basılır.
+        # Periyot genişlikten uzunsa şerit genişlik kadar kaydıkça yeni tabanla yeniden çizilir.
+        p = self.params
+        dpr = self.devicePixelRatioF()
+        main = self.tap is None and self.phosphor is None
+        key = (p.w_type, p.duty, p.rect, p.amp_p, p.amp_n, p.is_asym, p.timebase, p.freq, p.dual_trace, id(p.awg), main, w, h, dpr)
+        period = 2 * np.pi * 50 / freq_scale
+        shift = self.offset * 50 / freq_scale
+        periodic = period <= w
+        if self.trace_key != key or (not periodic and not 0 <= shift - self.trace_base < w):
+            self.trace_base = 0.0 if periodic else shift
+            span = w + int(np.ceil(period if periodic else w)) + 1
+            pm = QPixmap(int(span * dpr), int(h * dpr)); pm.setDevicePixelRatio(dpr)
+            pm.fill(Qt.transparent)
+            painter = QPainter(pm)
+            painter.setRenderHint(QPainter.Antialiasing)
+            xs = np.arange(span, dtype=np.float64)
+            base = self.trace_base * freq_scale / 50
+            if p.dual_trace:
+                self.draw_trace(painter, xs, h, freq_scale, QColor(0, 150, 255, 100), 0.05, 0.05, False, base)
+            if main:
+                self.draw_trace(painter, xs, h, freq_scale, QColor(57, 255, 20), p.amp_p, p.amp_n, p.is_asym, base)
+            painter.end()
+            self.trace_pixmap, self.trace_key = pm, key
+        return self.trace_pixmap, (shift % period if periodic else shift - self.trace_base)
+
+    GAINS = (100, 50, 20, 10, 5, 2, 1)
+
+    def live_trace(self, w, h):
+        # Piksel başına örnek, model izindeki (x/50)*freq_scale fazıyla aynı zaman ölçeğinden gelir
+        spp = self.tap_rate * self.params.timebase / (2 * np.pi * 50000)
+        n = max(2, int(np.ceil(w * spp)) + 1)
+        fresh = self.window_samples is None or self.window_samples.size != n
+        if fresh: self.window_samples = np.zeros(n, dtype=np.float32)
+        data = self.window_samples
+        if fresh or not self.is_frozen:
+            trig = self.trigger
+            hit = None
+            if trig.mode != "Free":
+                # Seviye ekran ölçeğinde verilir; örnek biriminde önceki karenin kazancına bölünür
+                hit = trig.find(self.tap, (n - 1) // 2, n - (n - 1) // 2, self.tap_rate, trig.level / self.live_gain)
+            if hit is not None:
+                start, self.trigger_frac = hit
+                self.tap.read(start - (n - 1) // 2 + n, data)
+            elif trig.mode == "Free" or (trig.mode == "Auto" and trig.timed_out(self.tap.head, self.tap_rate)):
+                self.trigger_frac = 0.0
+                self.tap.latest(data)
+        # Otomatik kazanç: tepe değeri taşırmayan en büyük adım, osiloskop V/div gibi
+        peak = float(np.abs(data).max())
+        gain = next((g for g in self.GAINS if peak * g <= 1.0), 1)
+        self.live_gain = gain
+        scale = gain * h / 2.3
+        if spp >= 1:
+            # Piksel başına min/maks: hiçbir tepe kaybolmaz; her çift o sütunun dikey aralığı olur.
+            # Sütun sınırları da tetik kesri kadar kaydırılır (kesir < 1 <= spp, son sınır n'i aşmaz)
+            edges = (np.arange(w) * spp + self.trigger_frac).astype(np.intp)
+            ys = np.empty(2 * w)
+            ys[0::2] = np.maximum.reduceat(data, edges); ys[1::2] = np.minimum.reduceat(data, edges)
+            xs = np.repeat(np.arange(w, dtype=np.float64), 2)
+        else:
+            xs = np.arange(w, dtype=np.float64)
+            # Tetik geçişinin örnek altı kesri kaydırılır; yavaş taramada iz titremez
+            ys = np.interp(xs * spp + self.trigger_frac, np.arange(n), data)
+        return xs, h / 2 - ys * scale, gain
 
     def paintEvent(self, event):
-        if not self.params: return
+        p = self.params
+        if p is None: return
         painter = QPainter(self)
         painter.setRenderHint(QPainter.Antialiasing)
         w, h = self.width(), self.height()
-        mid_y = h / 2
-
-        grid_pen = QPen(QColor(0, 80, 0), 1, Qt.DotLine)
-        painter.setPen(grid_pen)
-        for i in range(1, 10): painter.drawLine(0, int(h*i/10), w, int(h*i/10))
-        for i in range(1, 12): painter.drawLine(int(w*i/12), 0, int(w*i/12), h)
-
-        painter.setPen(QPen(QColor(57, 255, 20, 100), 1.5))
-        painter.drawLine(0, int(mid_y), w, int(mid_y))
-
-        if not self.is_frozen: self.offset += 0.2
+        painter.drawPixmap(0, 0, self.background(w, h))
 
         # Zaman bazlı ölçeklendirme (Timebase)
         # Sürgü değeri 1 (geniş) ile 100 (sıkışık) arası değişiyor
-        time_factor = self.params.get('timebase', 50) / 10.0
-        freq = max(1, self.params.get('freq', 440))
+        time_factor = p.timebase / 10.0
+        freq = max(1, p.freq)
         freq_scale = (freq / 100.0) * time_factor
 
-        def draw_wave(color, amp_p, amp_n, is_asym, offset_val):
-            path = QPainterPath()
-            path.moveTo(0, mid_y)
-            scale_p = (h / 2.3) * np.sqrt(max(0.001, amp_p))
-            scale_n = (h / 2.3) * np.sqrt(max(0.001, amp_n))
-            for x in range(w):
-                v = (x / 50) * freq_scale + offset_val
-                if self.params['w_type'] == "Sine": val = np.sin(v)
-                elif self.params['w_type'] == "Square": val = 1 if (v % (2*np.pi)) < (2*np.pi*self.params['duty']) else -1
-                else: val = 2 * np.abs(2 * (v / (2*np.pi) - np.floor(v / (2*np.pi) + 0.5))) - 1
-                if self.params['rect'] == "Half": val = max(0, val)
-                s = scale_p if val >= 0 else (scale_n if is_asym else scale_p)
-                path.lineTo(x, mid_y - (val * s))
-            painter.setPen(QPen(color, 2))
-            painter.drawPath(path)
-
-        if self.params.get('dual_trace'):
-            draw_wave(QColor(0, 150, 255, 100), 0.05, 0.05, False, self.offset)
-        draw_wave(QColor(57, 255, 20), self.params['amp_p'], self.params['amp_n'], self.params['is_asym'], self.offset)
+        trig = self.trigger
+        if trig.mode != "Free" and self.tap is None and p.w_type not in NoiseSource.TYPES:
+            aligned = self.trigger_offset(w, freq_scale)
+            if aligned is not None and not (trig.mode == "Single" and not trig.armed):
+                self.offset = aligned
+                if trig.mode == "Single": trig.armed = False
+        raster = self.phosphor
+        main = self.tap is None and raster is None
+        xs = np.arange(w, dtype=np.float64)
+        if p.w_type in NoiseSource.TYPES:
+            # Gürültü periyodik değil ve her karede yeniden tohumlanır; şerit önbelleği yerine ucuz sütun aralıkları
+            if p.dual_trace:
+                self.draw_spans(painter, xs, self.trace(xs, h, freq_scale, 0.05, 0.05, False, self.offset), QColor(0, 150, 255, 100))
+            if main:
+                self.draw_spans(painter, xs, self.trace(xs, h, freq_scale, p.amp_p, p.amp_n, p.is_asym, self.offset), QColor(57, 255, 20))
+        elif p.dual_trace or main:
+            pm, shift = self.cached_trace(w, h, freq_scale)
+            painter.drawPixmap(QPointF(-shift, 0), pm)
+        source = ""
+        if self.tap is not None:
+            lx, ly, gain = self.live_trace(w, h)
+            source = f" | LIVE x{gain}"
+        elif raster is not None:
+            lx, ly = xs, self.trace(xs, h, freq_scale, p.amp_p, p.amp_n, p.is_asym, self.offset)
+        if raster is not None:
+            if raster.size != (w, h): raster.resize(w, h)
+            if not self.is_frozen:
+                raster.decay(time.perf_counter()); raster.deposit(lx, ly)
+            elif raster.held is not p:
+                # Donmuş ekran: iz, sürekli çalışmadaki denge parlaklığıyla bir kez yazılır
+                raster.clear(); raster.deposit(lx, ly, raster.persistence * self.fps)
+            raster.held = p if self.is_frozen else None
+            painter.drawImage(0, 0, raster.frame())
+        elif self.tap is not None:
+            self.draw_spans(painter, lx, ly, QColor(57, 255, 20))
+
+        if trig.mode != "Free":
+            # Tetik seviyesi sağ kenarda, tetik noktası üst kenarın ortasında işaretlenir
+            if self.tap is not None: level_y = h / 2 - trig.level * h / 2.3
+            else:
+                amp = p.amp_p if trig.level >= 0 or not p.is_asym else p.amp_n
+                level_y = h / 2 - trig.level * (h / 2.3) * np.sqrt(max(0.001, amp))
+            painter.setPen(QPen(QColor(255, 170, 0), 2))
+            painter.drawLine(QPointF(w - 10, level_y), QPointF(w - 2, level_y))
+            painter.drawLine(QPointF(w / 2, 2), QPointF(w / 2, 10))
+            state = "STOP" if trig.mode == "Single" and not trig.armed else trig.mode.upper()
+            source += f" | TRIG {state} {'+' if trig.slope == 'Rising' else '-'}"
 
         painter.setPen(QColor(200, 255, 200))
         painter.setFont(QFont("Monospace", 9))
         status = "FROZEN" if self.is_frozen else "RUNNING"
-        painter.drawText(10, 20, f"[{status}] {self.params['w_type']} | {self.params['freq']} Hz")
+        painter.drawText(10, 20, f"[{status}] {p.w_type} | {p.freq} Hz{source}")
+
+        if self.stats is not None:
+            lines = self.stats.summary_lines()
+            box = QRect(6, h - 16 * len(lines) - 12, w - 12, 16 * len(lines) + 6)
+            painter.fillRect(box, QColor(0, 0, 0, 160))
+            for i, line in enumerate(lines): painter.drawText(box.left() + 6, box.top() + 15 + 16 * i, line)
+
+class SpectrumView(QFrame):
+    FLOOR_DB = -120
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setStyleSheet("background-color: #002b00; border: 2px solid #001a00; border-radius: 4px;")
+        self.analyzer = SpectrumAnalyzer()
+        self.tap = None
+        self.sample_rate = 0
+        self.f0 = 0
+        # Yeni çerçeve hazır olduğunda boyanır; zamanlayıcı yalnızca yoklama yapar
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.poll)
+        group = QActionGroup(self)
+        for size in SpectrumAnalyzer.SIZES:
+            action = QAction(f"FFT {size}", group); action.setCheckable(True); action.setChecked(size == self.analyzer.size)
+            action.triggered.connect(lambda checked, n=size: self.set_size(n))
+            self.addAction(action)
+        self.setContextMenuPolicy(Qt.ActionsContextMenu)
+
+    def set_source(self, tap, sample_rate):
+        self.tap, self.sample_rate = tap, sample_rate
+        self.analyzer.reset()
+        self.reschedule(); self.update()
+
+    def set_size(self, size):
+        self.analyzer.set_size(size); self.update()
+
+    def set_fundamental(self, f0):
+        self.f0 = f0; self.update()
+
+    def reschedule(self):
+        if self.tap is not None and self.isVisible(): self.timer.start(33)
+        else: self.timer.stop()
+
+    def showEvent(self, event):
+        self.reschedule()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.reschedule()
+        super().hideEvent(event)
+
+    def poll(self):
+        if self.analyzer.feed(self.tap): self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        w, h = self.width(), self.height()
+        painter.setPen(QPen(QColor(0, 80, 0), 1, Qt.DotLine))
+        for db in range(-20, self.FLOOR_DB, -20): painter.drawLine(0, int(h * db / self.FLOOR_DB), w, int(h * db / self.FLOOR_DB))
+        for i in range(1, 8): painter.drawLine(int(w * i / 8), 0, int(w * i / 8), h)
+        painter.setFont(QFont("Monospace", 9))
+        a = self.analyzer
+        if self.tap is None or not a.frames:
+            painter.setPen(QColor(200, 255, 200))
+            painter.drawText(10, 20, "Spectrum: start audio")
+            return
+
+        # Kutular piksellere maksimumla indirgenir; dar tepeler kaybolmaz
+        db = a.levels_db()
+        edges = np.unique((np.arange(w) * (db.size / w)).astype(np.intp))
+        peaks = np.maximum.reduceat(db, edges)
+        xs = edges * (w / db.size)
+        ys = np.clip(peaks / self.FLOOR_DB, 0, 1) * h
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(QPen(QColor(57, 255, 20), 1.5))
+        painter.drawPolyline(make_polyline(xs, ys))
+
+        painter.setPen(QColor(200, 255, 200))
+        lines = [f"FFT {a.size} | {self.sample_rate / 2000:g} kHz | {a.frame_time * 1e6:.0f} us/frame"]
+        harmonics, thd = a.harmonics(self.f0, self.sample_rate) if self.f0 > 0 else ([], None)
+        if thd is not None:
+            lines.append(f"f0 {self.f0:g} Hz  THD {thd:.2f}%")
+            lines += [f"H{n} {f:>8.0f} Hz {level:7.1f} dBc" for n, f, level in harmonics[1:6]]
+        for i, line in enumerate(lines): painter.drawText(10, 20 + 16 * i, line)
+
+class MixerDialog(QDialog):
+    mixChanged = pyqtSignal()
+    COLUMNS = ["Waveform", "Freq (Hz)", "Amp %", "Neg Amp %", "Asym", "Duty %", "Rect"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Oscillator Mixer")
+        self.resize(640, 320)
+        layout = QVBoxLayout(self)
+
+        self.enable_check = QCheckBox("Enable mixer (replaces the main oscillator)")
+        self.enable_check.stateChanged.connect(self.mixChanged)
+        layout.addWidget(self.enable_check)
+
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        layout.addWidget(self.table)
+
+        row = QHBoxLayout()
+        add_btn = QPushButton("Add"); add_btn.clicked.connect(lambda: self.add_oscillator())
+        remove_btn = QPushButton("Remove"); remove_btn.clicked.connect(self.remove_oscillator)
+        self.headroom_spin = QDoubleSpinBox(); self.headroom_spin.setRange(0, 40); self.headroom_spin.setValue(6)
+        self.headroom_spin.setSuffix(" dB"); self.headroom_spin.valueChanged.connect(self.mixChanged)
+        self.clip_combo = QComboBox(); self.clip_combo.addItems(["Hard", "Soft"])
+        self.clip_combo.currentTextChanged.connect(self.mixChanged)
+        row.addWidget(add_btn); row.addWidget(remove_btn); row.addStretch(1)
+        row.addWidget(QLabel("Headroom:")); row.addWidget(self.headroom_spin)
+        row.addWidget(QLabel("Clipping:")); row.addWidget(self.clip_combo)
+        layout.addLayout(row)
+
+        close_btn = QPushButton("Close"); close_btn.clicked.connect(self.accept)
+        layout.addWidget(close_btn)
+
+    def add_oscillator(self, w_type="Sine", freq=1000.0, amp=5, amp_n=5, asym=False, duty=50, rect="Full"):
+        r = self.table.rowCount(); self.table.insertRow(r)
+        wave_combo = QComboBox(); wave_combo.addItems(["Sine", "Square", "Triangle"]); wave_combo.setCurrentText(w_type)
+        freq_spin = QDoubleSpinBox(); freq_spin.setRange(0.1, 96000); freq_spin.setDecimals(1); freq_spin.setValue(freq)
+        amp_spin = QSpinBox(); amp_spin.setRange(0, 100); amp_spin.setValue(amp)
+        amp_n_spin = QSpinBox(); amp_n_spin.setRange(0, 100); amp_n_spin.setValue(amp_n)
+        asym_check = QCheckBox(); asym_check.setChecked(asym)
+        duty_spin = QSpinBox(); duty_spin.setRange(1, 99); duty_spin.setValue(duty)
+        rect_combo = QComboBox(); rect_combo.addItems(["Full", "Half"]); rect_combo.setCurrentText(rect)
+        for col, w in enumerate([wave_combo, freq_spin, amp_spin, amp_n_spin, asym_check, duty_spin, rect_combo]):
+            self.table.setCellWidget(r, col, w)
+        wave_combo.currentTextChanged.connect(self.mixChanged); rect_combo.currentTextChanged.connect(self.mixChanged)
+        freq_spin.valueChanged.connect(self.mixChanged); asym_check.stateChanged.connect(self.mixChanged)
+        for spin in (amp_spin, amp_n_spin, duty_spin): spin.valueChanged.connect(self.mixChanged)
+        self.mixChanged.emit()
+
+    def remove_oscillator(self):
+        r = self.table.currentRow()
+        if r < 0: r = self.table.rowCount() - 1
+        if r >= 0: self.table.removeRow(r); self.mixChanged.emit()
+
+    def oscillators(self):
+        cell = self.table.cellWidget
+        return [WaveParams(w_type=cell(r, 0).currentText(), freq=cell(r, 1).value(),
+                           amp_p=cell(r, 2).value() / 100.0, amp_n=cell(r, 3).value() / 100.0,
+                           is_asym=cell(r, 4).isChecked(), duty=cell(r, 5).value() / 100.0,
+                           rect=cell(r, 6).currentText()) for r in range(self.table.rowCount())]
+
+class ModulationDialog(QDialog):
+    modulationChanged = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Modulation")
+        layout = QVBoxLayout(self)
+        self.enable_check = QCheckBox("Enable modulation")
+        layout.addWidget(self.enable_check)
+
+        row = QHBoxLayout()
+        self.kind_combo = QComboBox(); self.kind_combo.addItems(list(Modulation.KINDS))
+        self.shape_combo = QComboBox(); self.shape_combo.addItems(list(Modulation.SHAPES))
+        row.addWidget(QLabel("Type:")); row.addWidget(self.kind_combo); row.addWidget(QLabel("Modulator:")); row.addWidget(self.shape_combo)
+        layout.addLayout(row)
+
+        row = QHBoxLayout()
+        self.rate_spin = QDoubleSpinBox(); self.rate_spin.setRange(0.01, 20000); self.rate_spin.setDecimals(2); self.rate_spin.setValue(5); self.rate_spin.setSuffix(" Hz")
+        self.depth_spin = QDoubleSpinBox(); self.depth_spin.setDecimals(1)
+        row.addWidget(QLabel("Rate:")); row.addWidget(self.rate_spin); row.addWidget(QLabel("Depth:")); row.addWidget(self.depth_spin)
+        layout.addLayout(row)
+        self.note_label = QLabel("")
+        layout.addWidget(self.note_label)
+        self.on_kind(self.kind_combo.currentText())
+
+        self.kind_combo.currentTextChanged.connect(self.on_kind)
+        for signal in (self.enable_check.toggled, self.kind_combo.currentTextChanged, self.shape_combo.currentTextChanged,
+                       self.rate_spin.valueChanged, self.depth_spin.valueChanged):
+            signal.connect(self.modulationChanged)
+
+    def on_kind(self, kind):
+        # Derinlik birimi türe göre değişir
+        self.depth_spin.blockSignals(True)
+        if kind == "FM": self.depth_spin.setRange(0, 20000); self.depth_spin.setSuffix(" Hz"); self.depth_spin.setValue(100)
+        elif kind == "PWM": self.depth_spin.setRange(0, 49); self.depth_spin.setSuffix(" %"); self.depth_spin.setValue(25)
+        else: self.depth_spin.setRange(0, 100); self.depth_spin.setSuffix(" %"); self.depth_spin.setValue(50)
+        self.depth_spin.blockSignals(False)
+        self.note_label.setText("PWM modulates the duty cycle of the Square waveform." if kind == "PWM" else "")
+
+    def make_modulation(self, sample_rate, previous=None):
+        if not self.enable_check.isChecked(): return None
+        kind = self.kind_combo.currentText()
+        depth = self.depth_spin.value() if kind == "FM" else self.depth_spin.value() / 100.0
+        return Modulation(kind, self.shape_combo.currentText(), self.rate_spin.value(), depth, sample_rate, previous)
+
+class SweepDialog(QDialog):
+    sweepToggled = pyqtSignal(bool)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Frequency Sweep")
+        layout = QVBoxLayout(self)
+
+        def spin(label, low, high, value, suffix, decimals=1):
+            row = QHBoxLayout(); row.addWidget(QLabel(label))
+            box = QDoubleSpinBox(); box.setRange(low, high); box.setDecimals(decimals); box.setValue(value); box.setSuffix(suffix)
+            row.addWidget(box); layout.addLayout(row)
+            return box
+        self.start_spin = spin("Start:", 0.1, 96000, 20, " Hz")
+        self.stop_spin = spin("Stop:", 0.1, 96000, 20000, " Hz")
+        self.duration_spin = spin("Duration:", 0.01, 3600, 10, " s", 2)
+
+        row = QHBoxLayout()
+        self.mode_combo = QComboBox(); self.mode_combo.addItems(["Linear", "Log"])
+        self.repeat_check = QCheckBox("Repeat")
+        row.addWidget(QLabel("Mode:")); row.addWidget(self.mode_combo); row.addWidget(self.repeat_check)
+        layout.addLayout(row)
+
+        self.now_label = QLabel("Idle")
+        layout.addWidget(self.now_label)
+        self.run_btn = QPushButton("Start Sweep"); self.run_btn.setCheckable(True)
+        self.run_btn.toggled.connect(self.on_toggled)
+        layout.addWidget(self.run_btn)
+
+    def on_toggled(self, running):
+        self.run_btn.setText("Stop Sweep" if running else "Start Sweep")
+        for w in (self.start_spin, self.stop_spin, self.duration_spin, self.mode_combo, self.repeat_check):
+            w.setEnabled(not running)
+        if not running: self.now_label.setText("Idle")
+        self.sweepToggled.emit(running)
+
+    def make_sweep(self, sample_rate):
+        return FrequencySweep(self.start_spin.value(), self.stop_spin.value(), self.duration_spin.value(),
+                              self.mode_combo.currentText(), self.repeat_check.isChecked(), sample_rate)
+
+class TriggerDialog(QDialog):
+    triggerChanged = pyqtSignal()
+    armRequested = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Trigger")
+        layout = QVBoxLayout(self)
+
+        row = QHBoxLayout()
+        self.mode_combo = QComboBox(); self.mode_combo.addItems(list(ScopeTrigger.MODES))
+        self.slope_combo = QComboBox(); self.slope_combo.addItems(list(ScopeTrigger.SLOPES))
+        row.addWidget(QLabel("Mode:")); row.addWidget(self.mode_combo); row.addWidget(QLabel("Edge:")); row.addWidget(self.slope_combo)
+        layout.addLayout(row)
+
+        row = QHBoxLayout()
+        self.level_spin = QDoubleSpinBox(); self.level_spin.setRange(-100, 100); self.level_spin.setDecimals(1); self.level_spin.setSuffix(" %")
+        self.level_spin.setToolTip("Percent of the displayed half-scale")
+        self.holdoff_spin = QDoubleSpinBox(); self.holdoff_spin.setRange(0, 1000); self.holdoff_spin.setDecimals(2); self.holdoff_spin.setSuffix(" ms")
+        row.addWidget(QLabel("Level:")); row.addWidget(self.level_spin); row.addWidget(QLabel("Holdoff:")); row.addWidget(self.holdoff_spin)
+        layout.addLayout(row)
+
+        self.arm_btn = QPushButton("Arm Single")
+        self.arm_btn.clicked.connect(self.armRequested)
+        layout.addWidget(self.arm_btn)
+
+        for signal in (self.mode_combo.currentTextChanged, self.slope_combo.currentTextChanged,
+                       self.level_spin.valueChanged, self.holdoff_spin.valueChanged):
+            signal.connect(self.triggerChanged)
+
+    def make_trigger(self):
+        return ScopeTrigger(self.mode_combo.currentText(), self.slope_combo.currentText(),
+                            self.level_spin.value() / 100.0, self.holdoff_spin.value() / 1000.0)
+
+class OutputDialog(QDialog):
+    formatChanged = pyqtSignal()
+    RATES = (44100, 48000, 96000, 192000)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Audio Output")
+        layout = QVBoxLayout(self)
+
+        def combo(label):
+            row = QHBoxLayout(); row.addWidget(QLabel(label))
+            box = QComboBox(); row.addWidget(box, 1); layout.addLayout(row)
+            return box
+        self.rate_combo = combo("Sample rate:")
+        self.type_combo = combo("Sample format:")
+        self.channels_combo = combo("Channels:")
+        self.note_label = QLabel("")
+        layout.addWidget(self.note_label)
+        apply_btn = QPushButton("Apply"); apply_btn.clicked.connect(self.formatChanged)
+        layout.addWidget(apply_btn)
+
+    def set_capabilities(self, rates, float_ok, stereo_ok):
+        # Cihazın desteklemediği seçenekler listelenmez
+        self.rate_combo.clear()
+        for r in rates: self.rate_combo.addItem(f"{r} Hz", r)
+        self.type_combo.clear(); self.type_combo.addItems(["int16", "float32"] if float_ok else ["int16"])
+        self.channels_combo.clear(); self.channels_combo.addItems(list(AudioGenerator.CHANNEL_MODES) if stereo_ok else ["Mono"])
+        missing = [str(r) for r in self.RATES if r not in rates] + ([] if float_ok else ["float32"]) + ([] if stereo_ok else ["stereo"])
+        self.note_label.setText(f"Not supported by the device: {', '.join(missing)}" if missing else "")
+
+    def settings(self):
+        return self.rate_combo.currentData(), self.type_combo.currentText(), self.channels_combo.currentText()
 
 class SignalGenerator(QWidget):
-    def __init__(self):
+    def __init__(self, audio_backend="auto", audio_clock="realtime"):
         super().__init__()
+        self.audio_backend = audio_backend
+        self.audio_clock = audio_clock
         self.is_playing = False
+        self.arbitrary = None
         base_dir = os.path.dirname(os.path.abspath(__file__))
         self.icon_path = os.path.join(base_dir, "icons", "singen.png")
         
@@ -158,15 +2020,63 @@ class SignalGenerator(QWidget):
         self.init_ui()
 
     def init_audio(self):
-        from PyQt5.QtMultimedia import QAudioFormat, QAudioOutput
+        self.audio_backend = self.pick_backend(self.audio_backend)
+        if self.audio_backend == "qt": from PyQt5.QtMultimedia import QAudio
+        else: QAudio = NullAudioOutput
+        self.audio_output = None
+        self.generator = AudioGenerator(None, self)
+        # Sentez ayrı iş parçacığında önceden yapıldığı için cihaz tamponu kesinti oranına göre küçük tutulabilir
+        self.latency = LatencyController("Safe")
+        self.latency_timer = QTimer(self)
+        self.latency_timer.timeout.connect(self.adapt_latency)
+        self.audio_states = {QAudio.ActiveState: "Active", QAudio.SuspendedState: "Suspended", QAudio.StoppedState: "Stopped",
+                             QAudio.IdleState: "Idle", QAudio.InterruptedState: "Interrupted"}
+        self.audio_errors = {QAudio.NoError: "", QAudio.OpenError: "Open", QAudio.IOError: "IO",
+                             QAudio.UnderrunError: "Underrun", QAudio.FatalError: "Fatal"}
+        self.open_output(44100, "int16", "Mono")
+
+    def pick_backend(self, requested):
+        # QtMultimedia ya da varsayılan çıkış aygıtı yoksa sanal saatli boş çıkışa düşülür
+        if requested == "null": return "null"
+        try:
+            from PyQt5.QtMultimedia import QAudioDeviceInfo
+        except ImportError:
+            if requested == "qt": raise
+            return "null"
+        if requested == "qt" or not QAudioDeviceInfo.defaultOutputDevice().isNull(): return "qt"
+        return "null"
+
+    def audio_format(self, rate, sample_type, channels):
+        from PyQt5.QtMultimedia import QAudioFormat
         fmt = QAudioFormat()
-        fmt.setSampleRate(44100); fmt.setChannelCount(1); fmt.setSampleSize(16)
-        fmt.setCodec("audio/pcm"); fmt.setByteOrder(QAudioFormat.LittleEndian); fmt.setSampleType(QAudioFormat.SignedInt)
-        self.audio_output = QAudioOutput(fmt, self)
-        self.generator = AudioGenerator(fmt, self)
+        fmt.setSampleRate(rate); fmt.setChannelCount(channels); fmt.setSampleSize(32 if sample_type == "float32" else 16)
+        fmt.setCodec("audio/pcm"); fmt.setByteOrder(QAudioFormat.LittleEndian)
+        fmt.setSampleType(QAudioFormat.Float if sample_type == "float32" else QAudioFormat.SignedInt)
+        return fmt
+
+    def output_capabilities(self):
+        if self.audio_backend == "null": return list(OutputDialog.RATES), True, True
+        from PyQt5.QtMultimedia import QAudioDeviceInfo
+        info = QAudioDeviceInfo.defaultOutputDevice()
+        rates = [r for r in OutputDialog.RATES if info.isFormatSupported(self.audio_format(r, "int16", 1))] or [44100]
+        return rates, info.isFormatSupported(self.audio_format(44100, "float32", 1)), info.isFormatSupported(self.audio_format(44100, "int16", 2))
+
+    def open_output(self, rate, sample_type, channel_mode):
+        if self.audio_output is not None:
+            self.audio_output.stop(); self.audio_output.deleteLater()
+        if self.audio_backend == "null":
+            self.generator.configure(None, rate, channel_mode, np.float32 if sample_type == "float32" else np.int16)
+            self.audio_output = NullAudioOutput(self.generator.sample_rate, self.generator.frame_bytes, self.audio_clock, self)
+        else:
+            from PyQt5.QtMultimedia import QAudioOutput
+            fmt = self.audio_format(rate, sample_type, 1 if channel_mode == "Mono" else 2)
+            self.audio_output = QAudioOutput(fmt, self)
+            self.generator.configure(fmt, channel_mode=channel_mode)
+        self.audio_output.stateChanged.connect(self.on_audio_state)
+        self.audio_output.notify.connect(self.on_audio_notify)
 
     def init_ui(self):
-        self.setWindowTitle("QSignal Generator")
+        self.setWindowTitle("QSignal Generator" if self.audio_backend == "qt" else f"QSignal Generator (no audio device, {self.audio_clock} clock)")
         self.setFixedSize(520, 610)
         
         if os.path.exists(self.icon_path):
@@ -179,7 +2089,34 @@ class SignalGenerator(QWidget):
         # PREVIEW
         self.preview_area = WavePreview(self)
         self.preview_area.setMinimumHeight(240)
-        main_layout.addWidget(self.preview_area)
+        self.spectrum_view = SpectrumView(self); self.spectrum_view.setFixedWidth(360); self.spectrum_view.setVisible(False)
+        h_view = QHBoxLayout(); h_view.addWidget(self.preview_area, 1); h_view.addWidget(self.spectrum_view)
+        main_layout.addLayout(h_view)
+        self.measure_label = QLabel("")
+        self.measure_label.setStyleSheet("background-color: #001a00; color: #c8ffc8; font-family: Monospace; font-size: 8pt; padding: 3px;")
+        self.measure_label.setFixedHeight(24); self.measure_label.setVisible(False)
+        main_layout.addWidget(self.measure_label)
+        self.measure_timer = QTimer(self)
+        self.measure_timer.timeout.connect(self.show_measurements)
+        self.stats_action = QAction("Show Audio Stats", self.preview_area); self.stats_action.setCheckable(True)
+        self.stats_action.toggled.connect(lambda on: self.preview_area.set_stats(self.generator.stats if on else None))
+        save_stats_action = QAction("Save Audio Stats...", self.preview_area)
+        save_stats_action.triggered.connect(self.save_stats)
+        reset_stats_action = QAction("Reset Audio Stats", self.preview_area)
+        reset_stats_action.triggered.connect(lambda: self.generator.stats.reset())
+        spectrum_action = QAction("Show Spectrum", self.preview_area); spectrum_action.setCheckable(True)
+        spectrum_action.toggled.connect(self.toggle_spectrum)
+        measure_action = QAction("Show Measurements", self.preview_area); measure_action.setCheckable(True)
+        measure_action.toggled.connect(self.toggle_measurements)
+        phosphor_action = QAction("Phosphor Display", self.preview_area); phosphor_action.setCheckable(True)
+        phosphor_action.toggled.connect(self.preview_area.set_phosphor)
+        self.trigger_dialog = TriggerDialog(self)
+        self.trigger_dialog.triggerChanged.connect(lambda: self.preview_area.set_trigger(self.trigger_dialog.make_trigger()))
+        self.trigger_dialog.armRequested.connect(self.arm_trigger)
+        trigger_action = QAction("Trigger...", self.preview_area)
+        trigger_action.triggered.connect(self.trigger_dialog.show)
+        self.preview_area.addActions([self.stats_action, save_stats_action, reset_stats_action, spectrum_action, measure_action, phosphor_action, trigger_action])
+        self.preview_area.setContextMenuPolicy(Qt.ActionsContextMenu)
         main_layout.addSpacing(5)
 
         # TOOLBAR
@@ -188,8 +2125,8 @@ class SignalGenerator(QWidget):
         self.freeze_btn = QPushButton("Freeze Screen"); self.freeze_btn.setCheckable(True)
         self.freeze_btn.setFixedHeight(28)
         self.freeze_btn.clicked.connect(self.toggle_freeze)
-        self.dual_check = QCheckBox("Dual Trace (Ref)"); self.dual_check.stateChanged.connect(self.sync_parameters)
-        self.asym_check = QCheckBox("Asymmetric Amp"); self.asym_check.stateChanged.connect(self.sync_parameters)
+        self.dual_check = QCheckBox("Dual Trace (Ref)"); self.dual_check.stateChanged.connect(self.request_sync)
+        self.asym_check = QCheckBox("Asymmetric Amp"); self.asym_check.stateChanged.connect(self.request_sync)
         tbar.addWidget(self.freeze_btn); tbar.addWidget(self.dual_check); tbar.addWidget(self.asym_check)
         main_layout.addLayout(tbar)
         main_layout.addSpacing(5)
@@ -198,15 +2135,19 @@ class SignalGenerator(QWidget):
         h_freq = QHBoxLayout()
         v_freq = QVBoxLayout(); v_freq.setSpacing(0)
         v_freq.addWidget(QLabel("Frequency (Hz):"))
-        self.freq_input = QLineEdit("440"); self.freq_input.textChanged.connect(self.sync_parameters)
+        self.freq_input = QLineEdit("440"); self.freq_input.textChanged.connect(self.request_sync)
         v_freq.addWidget(self.freq_input)
         
         v_time = QVBoxLayout(); v_time.setSpacing(0)
         self.time_label = QLabel("Timebase (Zoom):")
-        v_time.addWidget(self.time_label)
+        self.fps_combo = QComboBox(); self.fps_combo.addItems(["15 FPS", "30 FPS", "60 FPS"])
+        self.fps_combo.setCurrentText("30 FPS")
+        self.fps_combo.currentTextChanged.connect(lambda text: self.preview_area.set_fps(int(text.split()[0])))
+        h_time = QHBoxLayout(); h_time.addWidget(self.time_label); h_time.addStretch(1); h_time.addWidget(self.fps_combo)
+        v_time.addLayout(h_time)
         self.time_slider = QSlider(Qt.Horizontal)
         self.time_slider.setRange(1, 100); self.time_slider.setValue(10) # Başlangıçta makul bir zoom
-        self.time_slider.valueChanged.connect(self.sync_parameters)
+        self.time_slider.valueChanged.connect(self.request_sync)
         v_time.addWidget(self.time_slider)
         
         h_freq.addLayout(v_freq, 2); h_freq.addLayout(v_time, 3)
@@ -217,14 +2158,19 @@ class SignalGenerator(QWidget):
         h1 = QHBoxLayout()
         v_box1 = QVBoxLayout(); v_box1.setSpacing(0)
         v_box1.addWidget(QLabel("Waveform:"))
-        self.wave_combo = QComboBox(); self.wave_combo.addItems(["Sine", "Square", "Triangle"])
-        self.wave_combo.currentTextChanged.connect(self.sync_parameters)
-        v_box1.addWidget(self.wave_combo)
+        self.wave_combo = QComboBox(); self.wave_combo.addItems(["Sine", "Square", "Triangle", "Arbitrary"] + list(NoiseSource.TYPES))
+        self.wave_combo.currentTextChanged.connect(self.request_sync)
+        self.awg_btn = QPushButton("Load..."); self.awg_btn.setVisible(False)
+        self.awg_btn.clicked.connect(self.load_arbitrary)
+        self.awg_native_check = QCheckBox("Native rate"); self.awg_native_check.setVisible(False)
+        self.awg_native_check.toggled.connect(self.set_arbitrary_native)
+        h_wave = QHBoxLayout(); h_wave.addWidget(self.wave_combo, 1); h_wave.addWidget(self.awg_btn); h_wave.addWidget(self.awg_native_check)
+        v_box1.addLayout(h_wave)
         
         v_box2 = QVBoxLayout(); v_box2.setSpacing(0)
         v_box2.addWidget(QLabel("Rectification:"))
         self.rect_combo = QComboBox(); self.rect_combo.addItems(["Full", "Half"])
-        self.rect_combo.currentTextChanged.connect(self.sync_parameters)
+        self.rect_combo.currentTextChanged.connect(self.request_sync)
         v_box2.addWidget(self.rect_combo)
         
         h1.addLayout(v_box1); h1.addLayout(v_box2)
@@ -233,17 +2179,17 @@ class SignalGenerator(QWidget):
 
         # AMPLITUDES
         self.amp_p_widget = RulerSlider("Amplitude (5%) - Be careful!", 0, 100, 5)
-        self.amp_p_widget.slider.valueChanged.connect(self.sync_parameters)
+        self.amp_p_widget.slider.valueChanged.connect(self.request_sync)
         main_layout.addWidget(self.amp_p_widget)
 
         self.amp_n_widget = RulerSlider("Negative Amplitude (5%) - Be Careful!", 0, 100, 5)
-        self.amp_n_widget.slider.valueChanged.connect(self.sync_parameters)
+        self.amp_n_widget.slider.valueChanged.connect(self.request_sync)
         self.amp_n_widget.setVisible(False)
         main_layout.addWidget(self.amp_n_widget)
 
         # DUTY CYCLE
         self.duty_widget = RulerSlider("Duty Cycle (50%):", 1, 99, 50)
-        self.duty_widget.slider.valueChanged.connect(self.sync_parameters)
+        self.duty_widget.slider.valueChanged.connect(self.request_sync)
         main_layout.addWidget(self.duty_widget)
 
         main_layout.addStretch(1)
@@ -256,11 +2202,53 @@ class SignalGenerator(QWidget):
         
         main_layout.addSpacing(5)
 
-        # ABOUT BUTTON
+        # MIXER & ABOUT BUTTONS
+        h_btn = QHBoxLayout()
+        self.mixer_dialog = MixerDialog(self)
+        self.mixer_dialog.mixChanged.connect(self.apply_mixer)
+        self.mixer_btn = QPushButton("Mixer...")
+        self.mixer_btn.setFixedHeight(30)
+        self.mixer_btn.clicked.connect(self.mixer_dialog.show)
+        h_btn.addWidget(self.mixer_btn)
+
+        self.sweep_dialog = SweepDialog(self)
+        self.sweep_dialog.sweepToggled.connect(self.toggle_sweep)
+        self.sweep_btn = QPushButton("Sweep...")
+        self.sweep_btn.setFixedHeight(30)
+        self.sweep_btn.clicked.connect(self.sweep_dialog.show)
+        h_btn.addWidget(self.sweep_btn)
+        self.sweep_timer = QTimer(self)
+        self.sweep_timer.timeout.connect(self.show_sweep_frequency)
+
+        self.mod_dialog = ModulationDialog(self)
+        self.mod_dialog.modulationChanged.connect(self.apply_modulation)
+        self.mod_btn = QPushButton("Mod...")
+        self.mod_btn.setToolTip("AM / FM / PWM modulation")
+        self.mod_btn.setFixedHeight(30)
+        self.mod_btn.clicked.connect(self.mod_dialog.show)
+        h_btn.addWidget(self.mod_btn)
+
+        self.latency_combo = QComboBox(); self.latency_combo.addItems(list(LatencyController.PROFILES))
+        self.latency_combo.setCurrentText(self.latency.profile); self.latency_combo.setFixedHeight(30)
+        self.latency_combo.currentTextChanged.connect(self.set_latency_profile)
+        h_btn.addWidget(self.latency_combo); self.apply_latency()
+
+        self.output_dialog = OutputDialog(self)
+        self.output_dialog.formatChanged.connect(self.apply_output)
+        self.output_btn = QPushButton("Output...")
+        self.output_btn.setFixedHeight(30)
+        self.output_btn.clicked.connect(self.show_output)
+        h_btn.addWidget(self.output_btn)
+
         self.about_btn = QPushButton("About")
         self.about_btn.setFixedHeight(30)
         self.about_btn.clicked.connect(self.show_about)
-        main_layout.addWidget(self.about_btn)
+        h_btn.addWidget(self.about_btn)
+        main_layout.addLayout(h_btn)
+
+        # Sürgü sürüklemesi gibi ardışık sinyaller olay döngüsünün tek turunda tek görüntüye birleştirilir
+        self.sync_timer = QTimer(self); self.sync_timer.setSingleShot(True)
+        self.sync_timer.timeout.connect(self.sync_parameters)
 
         self.setLayout(main_layout); self.sync_parameters()
 
@@ -288,45 +2276,211 @@ class SignalGenerator(QWidget):
         about_box.setStandardButtons(QMessageBox.Ok)
         about_box.exec_()
 
+    def apply_modulation(self):
+        self.generator.modulation = self.mod_dialog.make_modulation(self.generator.sample_rate, self.generator.modulation)
+        self.update_fundamental()
+
+    def toggle_spectrum(self, shown):
+        self.spectrum_view.setVisible(shown)
+        self.fit_window()
+
+    def toggle_measurements(self, shown):
+        # Ölçüm yalnızca panel açıkken ses yolunda çalışır
+        self.generator.measure = StreamMeasurements(self.generator.sample_rate) if shown else None
+        self.measure_label.setText("Measuring...")
+        self.measure_label.setVisible(shown)
+        if shown: self.measure_timer.start(250)
+        else: self.measure_timer.stop()
+        self.fit_window()
+
+    def fit_window(self):
+        self.setFixedSize(520 + (self.spectrum_view.width() + 6 if self.spectrum_view.isVisibleTo(self) else 0),
+                          610 + (self.measure_label.height() if self.measure_label.isVisibleTo(self) else 0))
+
+    def show_measurements(self):
+        measure = self.generator.measure
+        m = measure.result if measure is not None else None
+        if m is None or not self.is_playing:
+            self.measure_label.setText("Measuring..." if self.is_playing else "Start output to measure")
+            return
+        rms_db = 20 * np.log10(m.rms) if m.rms > 0 else -np.inf
+        freq = f"{m.freq:.2f} Hz" if m.freq > 0 else "---"
+        self.measure_label.setText(f"Vpp {m.vpp:.3f} RMS {m.rms:.3f} ({rms_db:.1f} dBFS) DC {m.mean:+.3f} {freq} Duty {m.duty * 100:.1f}%")
+
+    def update_fundamental(self):
+        # Harmonik/THD yalnızca tek, sabit frekanslı periyodik sinyalde anlamlıdır
+        p = self.generator.params
+        periodic = (p.w_type in ("Sine", "Square", "Triangle") and self.generator.mixer is None
+                    and self.generator.requested_sweep is None and self.generator.modulation is None)
+        self.spectrum_view.set_fundamental(p.freq if periodic else 0)
+
+    def show_output(self):
+        d = self.output_dialog
+        current = (self.generator.sample_rate, self.generator.dtype.name, self.generator.channel_mode)
+        d.set_capabilities(*self.output_capabilities())
+        d.rate_combo.setCurrentText(f"{current[0]} Hz"); d.type_combo.setCurrentText(current[1]); d.channels_combo.setCurrentText(current[2])
+        d.show()
+
+    def apply_output(self):
+        playing = self.is_playing
+        if playing: self.toggle_playback()
+        self.open_output(*self.output_dialog.settings())
+        # Hıza bağlı nesneler yeni biçimle yeniden kurulur
+        self.apply_latency(); self.apply_mixer(); self.apply_modulation()
+        if self.generator.requested_sweep is not None: self.toggle_sweep(True)
+        if playing: self.toggle_playback()
+
+    def apply_mixer(self):
+        d = self.mixer_dialog
+        if d.enable_check.isChecked() and d.table.rowCount():
+            self.generator.mixer = OscillatorBank(d.oscillators(), self.generator.sample_rate, d.headroom_spin.value(),
+                                                  d.clip_combo.currentText(), previous=self.generator.mixer,
+                                                  quadrature=self.generator.rows == 2)
+        else:
+            self.generator.mixer = None
+        self.update_fundamental()
+
+    def load_arbitrary(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Load Arbitrary Waveform", "",
+                                              "Waveforms (*.wav *.csv *.txt *.raw *.pcm *.bin *.s16 *.f32);;All files (*)")
+        if not path: return
+        raw_dtype = None
+        if os.path.splitext(path)[1].lower() not in (".wav", ".csv", ".txt", ".s16", ".f32"):
+            raw_dtype, ok = QInputDialog.getItem(self, "Raw Sample Format", "Sample type:", ["int16", "float32"], 0, False)
+            if not ok: return
+        try: wave_data = ArbitraryWave.load(path, raw_dtype)
+        except (OSError, ValueError) as e:
+            QMessageBox.warning(self, "Arbitrary Waveform", f"Could not load {os.path.basename(path)}:\n{e}")
+            return
+        self.arbitrary = wave_data
+        self.awg_native_check.blockSignals(True); self.awg_native_check.setChecked(wave_data.native); self.awg_native_check.blockSignals(False)
+        self.awg_btn.setToolTip(f"{wave_data.name} ({wave_data.length} samples)")
+        self.sync_parameters()
+
+    def set_arbitrary_native(self, native):
+        if self.arbitrary is not None: self.arbitrary = self.arbitrary.with_native(native)
+        self.sync_parameters()
+
+    def on_audio_state(self, state):
+        self.generator.stats.record_state(self.audio_states.get(state, str(state)), self.audio_errors.get(self.audio_output.error(), ""))
+
+    def on_audio_notify(self):
+        size = self.audio_output.bufferSize()
+        if size > 0: self.generator.stats.record_device_fill((size - self.audio_output.bytesFree()) / size)
+        if self.audio_backend == "null": self.generator.stats.record_clock(*self.audio_output.report())
+
+    def apply_latency(self):
+        # QAudioOutput tampon boyutunu yalnızca start() sırasında okur, çalarken yeniden başlatmak gerekir
+        playing = self.is_playing
+        if playing: self.audio_output.stop()
+        self.generator.set_ring_target(self.latency.buffer_ms)
+        self.audio_output.setBufferSize(self.latency.buffer_bytes(self.generator.sample_rate, self.generator.frame_bytes))
+        self.audio_output.setNotifyInterval(self.latency.notify_ms())
+        if playing: self.audio_output.start(self.generator)
+        self.latency_combo.setToolTip(f"Audio buffer: {self.latency.buffer_ms:.0f} ms ({self.latency.min_ms}-{self.latency.max_ms} ms)")
+
+    def set_latency_profile(self, profile):
+        self.latency.set_profile(profile); self.apply_latency()
+
+    def adapt_latency(self):
+        # Halka kesintisi üreticinin geride kaldığını gösterir; büyük cihaz tamponu onu düzeltmez, yalnızca cihaz kesintisi sayılır
+        if self.latency.update(self.generator.stats.device_underruns, self.latency_timer.interval() / 1000):
+            self.apply_latency()
+
+    def save_stats(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Save Audio Stats", "qsignal-stats.json", "JSON (*.json)")
+        if not path: return
+        try:
+            with open(path, "w") as f: json.dump(self.generator.stats.to_dict(), f, indent=2)
+        except OSError as e:
+            QMessageBox.warning(self, "Audio Stats", f"Could not save {os.path.basename(path)}:\n{e}")
+
+    def toggle_sweep(self, running):
+        if running:
+            self.generator.set_sweep(self.sweep_dialog.make_sweep(self.generator.sample_rate))
+            self.sweep_timer.start(100)
+        else:
+            self.generator.set_sweep(None)
+            self.sweep_timer.stop()
+        self.update_fundamental()
+
+    def show_sweep_frequency(self):
+        sweep = self.generator.sweep
+        if sweep is None or not self.sweep_dialog.isVisible(): return
+        state = "Done" if sweep.done else "Sweeping"
+        self.sweep_dialog.now_label.setText(f"{state}: {sweep.frequency_at(sweep.position):.1f} Hz")
+
+    def arm_trigger(self):
+        self.preview_area.trigger.arm(); self.preview_area.update()
+
     def toggle_freeze(self):
-        self.preview_area.is_frozen = self.freeze_btn.isChecked()
+        self.preview_area.set_frozen(self.freeze_btn.isChecked())
         self.freeze_btn.setText("Run Screen" if self.preview_area.is_frozen else "Freeze Screen")
 
+    def request_sync(self, *args):
+        self.sync_timer.start(0)
+
     def sync_parameters(self):
         asym = self.asym_check.isChecked()
         self.amp_n_widget.setVisible(asym)
+        arbitrary = self.wave_combo.currentText() == "Arbitrary"
+        self.awg_btn.setVisible(arbitrary); self.awg_native_check.setVisible(arbitrary)
         try: freq = float(self.freq_input.text().replace(',', '.'))
         except: freq = 0
         
-        params = {
-            'freq': freq, 'w_type': self.wave_combo.currentText(),
-            'rect': self.rect_combo.currentText(), 'amp_p': self.amp_p_widget.slider.value()/100.0,
-            'amp_n': self.amp_n_widget.slider.value()/100.0, 'is_asym': asym,
-            'duty': self.duty_widget.slider.value()/100.0, 'dual_trace': self.dual_check.isChecked(),
-            'timebase': self.time_slider.value()
-        }
+        params = WaveParams(
+            freq=freq, w_type=self.wave_combo.currentText(),
+            rect=self.rect_combo.currentText(), amp_p=self.amp_p_widget.slider.value()/100.0,
+            amp_n=self.amp_n_widget.slider.value()/100.0, is_asym=asym,
+            duty=self.duty_widget.slider.value()/100.0, dual_trace=self.dual_check.isChecked(),
+            timebase=self.time_slider.value(), awg=self.arbitrary
+        )
         
         self.amp_p_widget.label.setText(f"{'Positive ' if asym else ''}Amplitude ({self.amp_p_widget.slider.value()}%) - Be careful!")
         self.amp_n_widget.label.setText(f"Negative Amplitude ({self.amp_n_widget.slider.value()}%) - Be careful!")
         self.duty_widget.label.setText(f"Duty Cycle ({self.duty_widget.slider.value()}%):")
         self.time_label.setText(f"Timebase (Zoom: {self.time_slider.value()}):")
         
-        self.generator.frequency = params['freq']
-        self.generator.wave_type = params['w_type']
-        self.generator.amp_pos = params['amp_p']; self.generator.amp_neg = params['amp_n']
-        self.generator.is_asymmetric = params['is_asym']; self.generator.duty_cycle = params['duty']
-        self.generator.rectification = params['rect']
+        self.generator.params = params
         self.preview_area.update_params(params)
+        self.update_fundamental()
 
     def toggle_playback(self):
         if not self.is_playing:
-            self.generator.start(); self.audio_output.start(self.generator)
+            # Hızlı sanal saatte üretici iş parçacığı atlanır; ölçülen, sentezin kendisidir
+            self.generator.start(threaded=self.audio_backend == "qt" or self.audio_clock == "realtime")
+            self.audio_output.start(self.generator)
+            self.latency.reset(); self.latency_timer.start(1000)
+            self.preview_area.set_source(self.generator.tap, self.generator.sample_rate)
+            self.spectrum_view.set_source(self.generator.tap, self.generator.sample_rate)
             self.toggle_button.setText("STOP AUDIO"); self.toggle_button.setStyleSheet("background-color: #8b0000; color: white; font-weight: bold; font-size: 14px;")
             self.is_playing = True
         else:
-            self.audio_output.stop(); self.generator.stop()
+            self.latency_timer.stop(); self.audio_output.stop(); self.generator.stop()
+            self.preview_area.set_source(None, 0)
+            self.spectrum_view.set_source(None, 0)
             self.toggle_button.setText("START AUDIO"); self.toggle_button.setStyleSheet("background-color: darkgreen; color: white; font-weight: bold; font-size: 14px;")
             self.is_playing = False
 
+def gui_main(argv):
+    parser = argparse.ArgumentParser(prog="wavegen.py", description="QSignal Generator. Pass --render FILE for offline rendering to a file.")
+    parser.add_argument("--audio", choices=["auto", "qt", "null"], default="auto", help="null pulls samples on a virtual clock without sound hardware")
+    parser.add_argument("--clock", choices=list(NullAudioOutput.CLOCKS), default="realtime", help="pace of the null output")
+    parser.add_argument("--run-seconds", type=float, metavar="SECONDS", help="headless: play for SECONDS, print the audio stats as JSON and exit")
+    args, qt_args = parser.parse_known_args(argv)
+    if args.run_seconds is not None: os.environ["QT_QPA_PLATFORM"] = "offscreen"
+    app = QApplication(sys.argv[:1] + qt_args)
+    window = SignalGenerator(args.audio, args.clock)
+    if args.run_seconds is None:
+        window.show()
+        return app.exec_()
+    window.toggle_playback()
+    QTimer.singleShot(int(args.run_seconds * 1000), app.quit)
+    app.exec_()
+    window.on_audio_notify(); window.toggle_playback()
+    json.dump(window.generator.stats.to_dict(), sys.stdout, indent=2); print()
+    return 0
+
 if __name__ == "__main__":
-    app = QApplication(sys.argv); window = SignalGenerator(); window.show(); sys.exit(app.exec_())
\ No newline at end of file
+    if any(a.startswith("--render") for a in sys.argv[1:]): sys.exit(render_main(sys.argv[1:]))
+    sys.exit(gui_main(sys.argv[1:]))
\ No newline at end of file
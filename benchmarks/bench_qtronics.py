@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+# QTronics Toolset sıcak yolları için tekrarlanabilir ölçüm ve altın çıktı denetimi
+#   python3 benchmarks/bench_qtronics.py              -> baseline.json ile karşılaştır
+#   python3 benchmarks/bench_qtronics.py --update     -> baseline.json dosyasını yeniden yaz
+import sys
+import os
+import json
+import time
+import hashlib
+import argparse
+import platform
+import importlib.util
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCES = {
+    'wavegen': os.path.join(ROOT, "QSignalGenerator.1.0", "usr", "share", "QSignalGenerator", "wavegen.py"),
+    'ledcalc': os.path.join(ROOT, "LEDCalc.1.4", "usr", "share", "LED Resistor Calculator", "LEDcalc.py"),
+    'rescalc': os.path.join(ROOT, "QResCalc.1.0", "usr", "share", "QResistorCalculator", "QResistorCalculator.py"),
+}
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+WAVES = ["Sine", "Square", "Triangle", "White Noise", "Pink Noise", "Brown Noise"]
+RECTS = ["Full", "Half"]
+BLOCKS = [256, 1024, 4096, 16384]
+SIZES = [(320, 160), (490, 240), (1280, 480), (1920, 1080)]
+GOLDEN_SAMPLES = 65536
+
+def load(name):
+    # Modüller paket değil, doğrudan dosya yolundan yüklenir; hepsi import sırasında platformu xcb'ye zorlar
+    spec = importlib.util.spec_from_file_location(name, SOURCES[name])
+    module = importlib.util.module_from_spec(spec); spec.loader.exec_module(module)
+    os.environ["QT_QPA_PLATFORM"] = "offscreen"
+    return module
+
+def rate(fn, repeat, budget, unit, scale=1):
+    # Önce ısınma (önbellekler, ilk ayırmalar), sonra ayar: çağrı sayısı ısınmış ölçümden hesaplanır.
+    # Sonuç tekrarların medyanıdır; spread = (en hızlı - en yavaş) / medyan, karşılaştırmada gürültü payıdır.
+    stop = time.perf_counter() + budget / 4; calls = 0
+    while calls < 3 or time.perf_counter() < stop: fn(); calls += 1
+    started = time.perf_counter()
+    for _ in range(calls): fn()
+    calls = max(1, int(calls * budget / max(time.perf_counter() - started, 1e-7)))
+    rates = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(calls): fn()
+        rates.append(scale * calls / (time.perf_counter() - started))
+    return summarize(rates, unit)
+
+def summarize(rates, unit):
+    rates = sorted(rates); median = rates[len(rates) // 2]
+    return {'unit': unit, 'value': median, 'spread': (rates[-1] - rates[0]) / median}
+
+def make_generator(W, wave, rect, asym):
+    g = W.AudioGenerator(sample_rate=44100)
+    g.params = W.WaveParams(freq=1000.0, w_type=wave, rect=rect, amp_p=0.8, amp_n=0.4 if asym else 0.8, is_asym=asym, duty=0.3)
+    g.noise = W.NoiseSource(1234)
+    g.open(W.QIODevice.ReadOnly)
+    return g
+
+def bench_audio(W, repeat, budget, results, golden):
+    for wave in WAVES:
+        for rect in RECTS:
+            for asym in (False, True):
+                case = f"{wave}/{rect}/{'asym' if asym else 'sym'}"
+                g = make_generator(W, wave, rect, asym)
+                digest = hashlib.sha256()
+                for _ in range(GOLDEN_SAMPLES // 1024): digest.update(g.readData(1024 * g.frame_bytes))
+                golden[f"audio/{case}"] = digest.hexdigest()
+                for block in BLOCKS:
+                    g = make_generator(W, wave, rect, asym); size = block * g.frame_bytes
+                    results[f"readData/{case}/{block}"] = rate(lambda: g.readData(size), repeat, budget, "samples/s", block)
+
+def bench_preview(W, repeat, budget, results, golden):
+    from PyQt5.QtGui import QImage
+    preview = W.WavePreview()
+    for wave in WAVES:
+        for rect in RECTS:
+            params = W.WaveParams(freq=1000.0, w_type=wave, rect=rect, amp_p=0.8, amp_n=0.4, is_asym=True,
+                                  duty=0.3, dual_trace=True, timebase=10)
+            preview.update_params(params); preview.set_frozen(True)
+            xs = W.np.arange(490, dtype=W.np.float64)
+            ys = preview.trace(xs, 240, 1000.0 / 1000.0, 0.8, 0.4, True, 0.0)
+            golden[f"trace/{wave}/{rect}"] = hashlib.sha256(W.np.round(ys, 6).tobytes()).hexdigest()
+            for w, h in SIZES:
+                preview.resize(w, h); image = QImage(w, h, QImage.Format_ARGB32_Premultiplied)
+                results[f"paintEvent/{wave}/{rect}/{w}x{h}"] = rate(lambda: preview.render(image), repeat, budget, "frames/s")
+    # Fosfor tarayıcısı çalışır durumda ölçülür: her kare sönüm + iz yazımı + ARGB dönüşümü yapar
+    preview.set_phosphor(True); preview.set_frozen(False)
+    preview.update_params(W.WaveParams(freq=1000.0, w_type="Sine", amp_p=0.8, dual_trace=True, timebase=10))
+    for w, h in SIZES:
+        preview.resize(w, h); image = QImage(w, h, QImage.Format_ARGB32_Premultiplied)
+        results[f"paintEvent/phosphor/{w}x{h}"] = rate(lambda: preview.render(image), repeat, budget, "frames/s")
+
+def bench_nullsink(W, repeat, budget, results, golden):
+    # Tüm uygulama ses donanımı olmadan boş çıkışın hızlı saatiyle sürülür; süre ortasında UI'dan frekans değişir
+    from PyQt5.QtCore import QTimer, QEventLoop
+    seconds = max(0.5, 5 * budget)
+    for wave in ("Sine", "Square", "Pink Noise"):
+        rates = []
+        for _ in range(repeat):
+            window = W.SignalGenerator("null", "fast")
+            window.wave_combo.setCurrentText(wave); window.sync_parameters()
+            window.toggle_playback()
+            loop = QEventLoop()
+            QTimer.singleShot(int(seconds * 500), lambda: window.freq_input.setText("1234"))
+            QTimer.singleShot(int(seconds * 1000), loop.quit)
+            loop.exec_()
+            _, audio, wall, _, _ = window.audio_output.report()
+            window.toggle_playback(); window.deleteLater()
+            rates.append(audio / wall)
+        results[f"nullsink/{wave}"] = summarize(rates, "x realtime")
+
+def bench_ledcalc(L, repeat, budget, results, golden):
+    calc = L.LEDResistorCalculator()
+    calc.vs_input.setText("12"); calc.vf_input.setText("2,1"); calc.led_count_input.setText("3"); calc.if_input.setText("20")
+    calc.p_vs_input.setText("5"); calc.p_vf_input.setText("3.2"); calc.p_led_count_input.setText("4"); calc.p_if_input.setText("15")
+    calc.calculate_series(); calc.calculate_parallel()
+    labels = [calc.calc_res_label, calc.std_res_label, calc.pwr_res_label, calc.long_life_calc_label, calc.long_life_std_label,
+              calc.p_calc_res_label, calc.p_std_res_label, calc.p_pwr_res_label, calc.p_long_life_calc_label, calc.p_long_life_std_label]
+    values = [10 ** (e / 97.0) for e in range(-97, 680)]
+    golden["ledcalc/labels"] = hashlib.sha256("\n".join(l.text() for l in labels).encode()).hexdigest()
+    golden["ledcalc/e24"] = hashlib.sha256(repr([calc.find_nearest_standard_e24(v) for v in values]).encode()).hexdigest()
+    def e24():
+        for v in values: calc.format_resistance(calc.find_nearest_standard_e24(v))
+    results["ledcalc/calculate_series"] = rate(calc.calculate_series, repeat, budget, "calls/s")
+    results["ledcalc/calculate_parallel"] = rate(calc.calculate_parallel, repeat, budget, "calls/s")
+    results["ledcalc/find_nearest_standard_e24"] = rate(e24, repeat, budget, "calls/s", len(values))
+
+def bench_rescalc(R, repeat, budget, results, golden):
+    calc = R.ResistorCalculator()
+    names = ["Yellow", "Violet", "Black", "Red", "Gold"]
+    for combo, name in zip(calc.combos, names): combo.setCurrentText(name)
+    texts = []
+    for band4 in (True, False):
+        calc.radio_4band.setChecked(band4); calc.radio_5band.setChecked(not band4)
+        calc.calculate_from_colors(); texts.append(calc.result_label.text())
+    calc.radio_4band.setChecked(True); calc.radio_5band.setChecked(False)
+    calc.value_input.setText("4K7")
+    golden["rescalc/colors"] = hashlib.sha256("\n".join(texts).encode()).hexdigest()
+    results["rescalc/calculate_from_colors"] = rate(calc.calculate_from_colors, repeat, budget, "calls/s")
+    results["rescalc/calculate_from_value"] = rate(calc.calculate_from_value, repeat, budget, "calls/s")
+
+def compare(results, golden, baseline, tolerance):
+    # Eşik: verilen tolerans ile iki ölçümün kendi gürültüsünün toplamından büyüğü
+    failures = 0
+    print(f"{'benchmark':<48} {'value':>14} {'baseline':>14} {'change':>8} {'noise':>7}")
+    for name, r in results.items():
+        base = baseline.get('results', {}).get(name)
+        if base is None:
+            print(f"{name:<48} {r['value']:>14.1f} {'-':>14} {'new':>8}"); continue
+        change = r['value'] / base['value'] - 1
+        noise = r.get('spread', 0) + base.get('spread', 0)
+        flag = ""
+        if change < -max(tolerance, noise): flag = "  REGRESSION"; failures += 1
+        print(f"{name:<48} {r['value']:>14.1f} {base['value']:>14.1f} {change:>+7.1%} {noise:>6.1%}{flag}")
+    for name, digest in golden.items():
+        expected = baseline.get('golden', {}).get(name)
+        if expected is not None and expected != digest:
+            print(f"GOLDEN MISMATCH {name}: {digest[:16]} != {expected[:16]}"); failures += 1
+    return failures
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="QTronics Toolset benchmarks")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="stored baseline JSON")
+    parser.add_argument("--update", action="store_true", help="write the current results as the new baseline")
+    parser.add_argument("--tolerance", type=float, help="minimum slowdown before flagging (fraction), default 0.25, 0.4 with --quick; "
+                                                       "a case's own measured spread raises it further")
+    parser.add_argument("--repeat", type=int, default=7, help="timing repeats, the median is kept")
+    parser.add_argument("--quick", action="store_true", help="shorter runs for a smoke check")
+    parser.add_argument("--only", choices=["audio", "preview", "nullsink", "ledcalc", "rescalc"], action="append", help="run only these groups")
+    parser.add_argument("--json", metavar="FILE", help="also write the results to FILE")
+    args = parser.parse_args(argv)
+
+    os.environ["QT_QPA_PLATFORM"] = "offscreen"
+    from PyQt5.QtWidgets import QApplication
+    groups = args.only or ["audio", "preview", "nullsink", "ledcalc", "rescalc"]
+    W = load('wavegen'); app = QApplication.instance() or QApplication([])
+    budget = 0.05 if args.quick else 0.2
+    results = {}; golden = {}
+    if "audio" in groups: bench_audio(W, args.repeat, budget, results, golden)
+    if "preview" in groups: bench_preview(W, args.repeat, budget, results, golden)
+    if "nullsink" in groups: bench_nullsink(W, args.repeat, budget, results, golden)
+    if "ledcalc" in groups: bench_ledcalc(load('ledcalc'), args.repeat, budget, results, golden)
+    if "rescalc" in groups: bench_rescalc(load('rescalc'), args.repeat, budget, results, golden)
+
+    report = {'platform': platform.platform(), 'python': platform.python_version(), 'numpy': W.np.__version__,
+              'results': results, 'golden': golden}
+    if args.json:
+        with open(args.json, "w") as f: json.dump(report, f, indent=2, sort_keys=True)
+    if args.update or not os.path.exists(args.baseline):
+        with open(args.baseline, "w") as f: json.dump(report, f, indent=2, sort_keys=True)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+    with open(args.baseline) as f: baseline = json.load(f)
+    tolerance = args.tolerance if args.tolerance is not None else (0.4 if args.quick else 0.25)
+    failures = compare(results, golden, baseline, tolerance)
+    print(f"{failures} problem(s)" if failures else "OK")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))